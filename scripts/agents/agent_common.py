@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the agent scripts.
+
+Pooled HTTP sessions that retry transient failures, throttling on
+GitHub's primary rate limit headers, and pulling the JSON object out of
+a model response.
+"""
+
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Below this many remaining requests, wait for the rate limit window to reset
+RATE_LIMIT_FLOOR = 5
+# Longest we wait for a reset; the primary limit can be up to an hour away
+MAX_THROTTLE_WAIT = 60
+
+
+def build_session(retries: int = 5, pool_size: int = 8) -> requests.Session:
+    """
+    Create a pooled session that retries transient failures.
+
+    429 and 5xx responses (including GitHub's secondary rate limits) are
+    retried with exponential backoff, honouring Retry-After.
+
+    Args:
+        retries: Total retries per request
+        pool_size: Connections kept per host
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        respect_retry_after_header=True
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=pool_size))
+    return session
+
+
+def throttle(response: requests.Response) -> bool:
+    """
+    Sleep until the rate limit resets when few requests remain.
+
+    Waits of more than MAX_THROTTLE_WAIT are not slept through.
+
+    Returns:
+        False if the limit is nearly exhausted and resets too far out to
+        wait for, so the caller should skip further requests; else True
+    """
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_FLOOR:
+        return True
+
+    wait = max(int(reset) - int(time.time()), 0) + 1
+    if wait > MAX_THROTTLE_WAIT:
+        print(f"⚠️  Rate limit nearly exhausted ({remaining} left), resets in {wait}s; not waiting")
+        return False
+
+    print(f"⏳ Rate limit nearly exhausted ({remaining} left), sleeping {wait}s")
+    time.sleep(wait)
+    return True
+
+
+def extract_json_object(text: str) -> str:
+    """
+    Slice the first balanced {...} object out of a model response.
+
+    Tracks brace depth outside of string literals, so fenced blocks, prose
+    around the JSON and braces inside string values are all handled.
+    """
+    start = text.find('{')
+    if start == -1:
+        return text
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return text[start:]
@@ -13,11 +13,17 @@ Features:
 import os
 import json
 import yaml
-import requests
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from agent_common import build_session, throttle
+
+# _get_cached result for a 304: the repo hasn't changed since its stored ETag
+NOT_MODIFIED = object()
+# Repository fields kept in the manifest for `status`
+METADATA_FIELDS = ("default_branch", "pushed_at", "archived")
+
 
 class SyncManager:
     def __init__(self, github_token: str, github_repo: str):
@@ -25,6 +31,14 @@ class SyncManager:
         self.github_repo = github_repo
         self.manifest_path = Path(".repo-index/manifest.yaml")
         self.sync_status_path = Path(".repo-index/sync-status.json")
+        self.session = build_session()
+        # Set once the rate limit resets too far out to wait for
+        self.rate_limited = False
+
+    def throttle(self, response):
+        """Wait out a nearly exhausted rate limit, or note that it can't be waited out."""
+        if not throttle(response):
+            self.rate_limited = True
 
     def load_manifest(self) -> Dict:
         """Load the repository manifest."""
@@ -110,14 +124,6 @@ class SyncManager:
         manifest = self.load_manifest()
         return manifest.get("derived_repos", [])
 
-    def get_repo_sync_status(self, repo_name: str) -> Optional[Dict]:
-        """Get sync status for a specific repository."""
-        repos = self.list_derived_repos()
-        for repo in repos:
-            if repo["name"] == repo_name:
-                return repo
-        return None
-
     def update_sync_status(self, repo_name: str, status: str, details: Dict = None):
         """
         Update sync status for a repository.
@@ -143,6 +149,71 @@ class SyncManager:
         manifest["last_updated"] = datetime.now().isoformat()
         self.save_manifest(manifest)
 
+    def _get_cached(self, url: str, repo_entry: Dict):
+        """
+        Conditional GET keyed on the ETag stored in a derived repo's manifest entry.
+
+        A 304 does not count against the primary rate limit, so polling unchanged
+        repos is nearly free. `last_checked` is only bumped when GitHub answered.
+
+        Returns:
+            The decoded body on 200, NOT_MODIFIED on 304, None on failure
+        """
+        headers = {
+            "Authorization": f"token {self.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        if repo_entry.get("etag"):
+            headers["If-None-Match"] = repo_entry["etag"]
+
+        response = self.session.get(url, headers=headers)
+        self.throttle(response)
+
+        if response.status_code == 304:
+            repo_entry["last_checked"] = datetime.now().isoformat()
+            return NOT_MODIFIED
+        if response.status_code != 200:
+            print(f"⚠️  GET {url} failed: {response.status_code}")
+            return None
+
+        repo_entry["last_checked"] = datetime.now().isoformat()
+        if response.headers.get("ETag"):
+            repo_entry["etag"] = response.headers["ETag"]
+        return response.json()
+
+    def fetch_repo_metadata(self, repo_name: str) -> Optional[Dict]:
+        """
+        Refresh a derived repository's GitHub metadata in its manifest entry.
+
+        Unchanged repos answer with a 304 and keep their cached metadata. The
+        manifest is rewritten whenever GitHub answered (200 or 304), so the
+        new last_checked is kept; a failed request leaves it untouched.
+
+        Returns:
+            The repository's manifest entry, or None if it isn't registered
+        """
+        manifest = self.load_manifest()
+        repo = next((r for r in manifest.get("derived_repos", []) if r["name"] == repo_name), None)
+        if repo is None:
+            return None
+
+        if not self.github_token:
+            print("⚠️  No GitHub token available, showing cached metadata")
+            return repo
+
+        try:
+            metadata = self._get_cached(f"https://api.github.com/repos/{repo_name}", repo)
+        except Exception as e:
+            print(f"❌ Error fetching metadata for {repo_name}: {e}")
+            return repo
+
+        if metadata is None:
+            return repo
+        if isinstance(metadata, dict):
+            repo["metadata"] = {key: metadata.get(key) for key in METADATA_FIELDS}
+        self.save_manifest(manifest)
+        return repo
+
     def trigger_sync_workflow(self, repo_name: str, sync_path: str) -> bool:
         """
         Trigger the bidirectional-sync workflow for a specific repository.
@@ -172,7 +243,8 @@ class SyncManager:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = self.session.post(url, headers=headers, json=data)
+            self.throttle(response)
             if response.status_code == 204:
                 print(f"✅ Triggered sync workflow for {repo_name}")
                 self.update_sync_status(repo_name, "in_progress")
@@ -198,6 +270,9 @@ class SyncManager:
 
         for repo in enabled_repos:
             for sync_path in repo.get("sync_paths", []):
+                if self.rate_limited:
+                    print("⏭️  Rate limit exhausted, skipping the remaining syncs")
+                    return
                 path_mapping = f"{sync_path['source']}:{sync_path['target']}"
                 print(f"  → {repo['name']} ({path_mapping})")
                 self.trigger_sync_workflow(repo['name'], path_mapping)
@@ -213,9 +288,18 @@ class SyncManager:
         report += f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
         report += f"**Total Repositories:** {len(repos)}\n\n"
 
+        # Columnar view of the registry: one pass over the dicts, then lockstep iteration
+        names = [r["name"] for r in repos]
+        enabled = [bool(r.get("sync_enabled", False)) for r in repos]
+        auto_sync = [bool(r.get("auto_sync", False)) for r in repos]
+        registered = [r.get("registered_at", "Unknown") for r in repos]
+        last_sync = [r.get("last_sync") for r in repos]
+        last_status = [r.get("last_sync_status") for r in repos]
+        sync_paths = [r.get("sync_paths", []) for r in repos]
+
         # Summary
-        enabled_count = len([r for r in repos if r.get("sync_enabled", False)])
-        auto_sync_count = len([r for r in repos if r.get("auto_sync", False)])
+        enabled_count = sum(enabled)
+        auto_sync_count = sum(auto_sync)
 
         report += "## Summary\n\n"
         report += f"- ✅ Enabled: {enabled_count}/{len(repos)}\n"
@@ -224,23 +308,24 @@ class SyncManager:
         # Individual repos
         report += "## Repositories\n\n"
 
-        for repo in repos:
-            report += f"### {repo['name']}\n\n"
-            report += f"- **Status:** {'✅ Enabled' if repo.get('sync_enabled') else '❌ Disabled'}\n"
-            report += f"- **Auto-sync:** {'✅ Yes' if repo.get('auto_sync') else '❌ No'}\n"
-            report += f"- **Registered:** {repo.get('registered_at', 'Unknown')}\n"
-
-            if repo.get('last_sync'):
-                status_emoji = {"success": "✅", "failed": "❌", "in_progress": "🔄"}.get(
-                    repo.get('last_sync_status', ''), '❓'
-                )
-                report += f"- **Last Sync:** {repo['last_sync']} {status_emoji} {repo.get('last_sync_status', 'Unknown')}\n"
+        status_emojis = {"success": "✅", "failed": "❌", "in_progress": "🔄"}
+        for name, is_enabled, is_auto, registered_at, synced_at, status, paths in zip(
+            names, enabled, auto_sync, registered, last_sync, last_status, sync_paths
+        ):
+            report += f"### {name}\n\n"
+            report += f"- **Status:** {'✅ Enabled' if is_enabled else '❌ Disabled'}\n"
+            report += f"- **Auto-sync:** {'✅ Yes' if is_auto else '❌ No'}\n"
+            report += f"- **Registered:** {registered_at}\n"
+
+            if synced_at:
+                status_emoji = status_emojis.get(status or '', '❓')
+                report += f"- **Last Sync:** {synced_at} {status_emoji} {status or 'Unknown'}\n"
             else:
                 report += f"- **Last Sync:** Never\n"
 
             # Sync paths
             report += f"- **Sync Paths:**\n"
-            for path in repo.get('sync_paths', []):
+            for path in paths:
                 report += f"  - `{path['source']}` → `{path['target']}` ({path.get('strategy', 'merge')})\n"
 
             report += "\n"
@@ -248,73 +333,84 @@ class SyncManager:
         return report
 
 
+def _register_cli(manager: SyncManager, args):
+    manager.register_derived_repo(args.repo, json.loads(args.sync_paths))
+
+
+def _unregister_cli(manager: SyncManager, args):
+    manager.unregister_derived_repo(args.repo)
+
+
+def _list_cli(manager: SyncManager, args):
+    repos = manager.list_derived_repos()
+    print(f"\n📋 Registered Repositories ({len(repos)}):\n")
+    for repo in repos:
+        status = "✅" if repo.get("sync_enabled") else "❌"
+        print(f"{status} {repo['name']}")
+
+
+def _status_cli(manager: SyncManager, args):
+    # Refreshes the entry's GitHub metadata; unchanged repos cost a free 304
+    status = manager.fetch_repo_metadata(args.repo)
+    if status:
+        print(json.dumps(status, indent=2))
+    else:
+        print(f"❌ Repository {args.repo} not found")
+
+
+def _sync_cli(manager: SyncManager, args):
+    manager.trigger_sync_workflow(args.repo, args.sync_path)
+
+
+def _sync_all_cli(manager: SyncManager, args):
+    manager.sync_all_enabled_repos()
+
+
+def _report_cli(manager: SyncManager, args):
+    report = manager.generate_sync_report()
+    print(report)
+
+    # Save to file
+    report_path = Path(".repo-index/sync-report.md")
+    report_path.write_text(report)
+    print(f"\n📄 Report saved to {report_path}")
+
+
+# command -> (required args, handler)
+COMMANDS = {
+    "register": (("repo", "sync_paths"), _register_cli),
+    "unregister": (("repo",), _unregister_cli),
+    "list": ((), _list_cli),
+    "status": (("repo",), _status_cli),
+    "sync": (("repo", "sync_path"), _sync_cli),
+    "sync-all": ((), _sync_all_cli),
+    "report": ((), _report_cli),
+}
+
+
 def main():
     """CLI interface for sync manager."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Factory Sync Manager")
-    parser.add_argument("command", choices=[
-        "register", "unregister", "list", "status", "sync", "sync-all", "report"
-    ])
+    parser.add_argument("command", choices=list(COMMANDS))
     parser.add_argument("--repo", help="Repository name (owner/repo)")
     parser.add_argument("--sync-paths", help="Sync paths JSON")
     parser.add_argument("--sync-path", help="Single sync path (source:target)")
 
     args = parser.parse_args()
 
+    required, handler = COMMANDS[args.command]
+    if any(not getattr(args, name) for name in required):
+        flags = " and ".join("--" + name.replace("_", "-") for name in required)
+        print(f"❌ {flags} required for {args.command}")
+        return 1
+
     github_token = os.getenv("GITHUB_TOKEN", "")
     github_repo = os.getenv("GITHUB_REPOSITORY", "")
 
     manager = SyncManager(github_token, github_repo)
-
-    if args.command == "register":
-        if not args.repo or not args.sync_paths:
-            print("❌ --repo and --sync-paths required for register")
-            return 1
-
-        sync_paths = json.loads(args.sync_paths)
-        manager.register_derived_repo(args.repo, sync_paths)
-
-    elif args.command == "unregister":
-        if not args.repo:
-            print("❌ --repo required for unregister")
-            return 1
-        manager.unregister_derived_repo(args.repo)
-
-    elif args.command == "list":
-        repos = manager.list_derived_repos()
-        print(f"\n📋 Registered Repositories ({len(repos)}):\n")
-        for repo in repos:
-            status = "✅" if repo.get("sync_enabled") else "❌"
-            print(f"{status} {repo['name']}")
-
-    elif args.command == "status":
-        if not args.repo:
-            print("❌ --repo required for status")
-            return 1
-        status = manager.get_repo_sync_status(args.repo)
-        if status:
-            print(json.dumps(status, indent=2))
-        else:
-            print(f"❌ Repository {args.repo} not found")
-
-    elif args.command == "sync":
-        if not args.repo or not args.sync_path:
-            print("❌ --repo and --sync-path required for sync")
-            return 1
-        manager.trigger_sync_workflow(args.repo, args.sync_path)
-
-    elif args.command == "sync-all":
-        manager.sync_all_enabled_repos()
-
-    elif args.command == "report":
-        report = manager.generate_sync_report()
-        print(report)
-
-        # Save to file
-        report_path = Path(".repo-index/sync-report.md")
-        report_path.write_text(report)
-        print(f"\n📄 Report saved to {report_path}")
+    handler(manager, args)
 
     return 0
 
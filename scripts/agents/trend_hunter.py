@@ -7,20 +7,93 @@ and creates GitHub issues for valuable ideas.
 
 import os
 import json
+import time
+import hashlib
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
-import requests
+from itertools import chain, zip_longest
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Any, List, Dict, Optional
 from anthropic import Anthropic
 
+from agent_common import build_session, extract_json_object
+
 # API Configuration
-HACKER_NEWS_TOP_STORIES_API = "https://hacker-news.firebaseio.com/v0/topstories.json"
-HACKER_NEWS_ITEM_API = "https://hacker-news.firebaseio.com/v0/item/{}.json"
+HACKER_NEWS_FRONT_PAGE_API = "https://hn.algolia.com/api/v1/search"
+HACKER_NEWS_ITEM_URL = "https://news.ycombinator.com/item?id={}"
 DEV_TO_API = "https://dev.to/api/articles"
 
 # GitHub Configuration
 GITHUB_API_URL = "https://api.github.com"
 GITHUB_REPO = os.environ.get("GITHUB_REPOSITORY", "")
 
+CLAUDE_MAX_RETRIES = 3
+
+# On-disk response cache (seconds to live per source)
+CACHE_DIR = Path(".trend_hunter_cache")
+HN_CACHE_TTL = 30 * 60
+DEVTO_CACHE_TTL = 2 * 60 * 60
+
+# Below this much signal a Claude call is not worth making
+MIN_TRENDS = 5
+MIN_TREND_CHARS = 500
+# Identical trend sets analyzed within this window are not re-sent to Claude
+IDEA_CACHE_TTL = 6 * 60 * 60
+
+# Prompt budget: number of trends sent to Claude and max title length
+PROMPT_TREND_LIMIT = 8
+PROMPT_TITLE_WIDTH = 120
+
+# Process-wide Claude client so repeated calls reuse one connection pool
+_CLAUDE: Optional[Anthropic] = None
+
+
+def _claude() -> Anthropic:
+    """Return the shared Anthropic client, creating it from the environment on first use."""
+    global _CLAUDE
+    if _CLAUDE is None:
+        _CLAUDE = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"), max_retries=CLAUDE_MAX_RETRIES)
+    return _CLAUDE
+
+
+# Shared by every fetch and the issue POST so connections and TLS state are reused;
+# transient 429/5xx responses are retried with exponential backoff
+SESSION = build_session(retries=3, pool_size=20)
+
+
+def cached_get_json(session, url: str, ttl: int, params: Optional[Dict] = None) -> Any:
+    """
+    GET a JSON resource, serving it from the on-disk cache while younger than ttl.
+
+    Args:
+        session: requests.Session used on a miss
+        url: Resource URL
+        ttl: Cache lifetime in seconds
+        params: Optional query parameters (part of the cache key)
+
+    Returns:
+        Decoded JSON body
+    """
+    key = hashlib.sha1(json.dumps([url, params], sort_keys=True).encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.json"
+
+    try:
+        if time.time() - cache_path.stat().st_mtime < ttl:
+            print(f"   ⚡ Cache HIT {url}")
+            return json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        pass
+
+    response = session.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    print(f"   🌐 Cache MISS {url}")
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    cache_path.write_text(response.text)
+    return response.json()
+
 
 def fetch_hacker_news_stories(count: int = 10) -> List[Dict]:
     """
@@ -35,31 +108,16 @@ def fetch_hacker_news_stories(count: int = 10) -> List[Dict]:
     print(f"📡 Fetching top {count} stories from Hacker News...")
 
     try:
-        # Get top story IDs
-        response = requests.get(HACKER_NEWS_TOP_STORIES_API, timeout=10)
-        response.raise_for_status()
-        story_ids = response.json()[:count]
+        # One Algolia query returns the whole front page, instead of one request per item
+        params = {'tags': 'front_page', 'hitsPerPage': count}
+        hits = cached_get_json(SESSION, HACKER_NEWS_FRONT_PAGE_API, HN_CACHE_TTL, params=params)['hits']
 
-        stories = []
-        for story_id in story_ids:
-            try:
-                item_response = requests.get(
-                    HACKER_NEWS_ITEM_API.format(story_id),
-                    timeout=10
-                )
-                item_response.raise_for_status()
-                item = item_response.json()
-
-                if item and item.get('type') == 'story':
-                    stories.append({
-                        'title': item.get('title', 'No title'),
-                        'url': item.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                        'score': item.get('score', 0),
-                        'source': 'Hacker News'
-                    })
-            except Exception as e:
-                print(f"   ⚠️  Error fetching story {story_id}: {e}")
-                continue
+        stories = [{
+            'title': hit.get('title') or 'No title',
+            'url': hit.get('url') or HACKER_NEWS_ITEM_URL.format(hit['objectID']),
+            'score': hit.get('points') or 0,
+            'source': 'Hacker News'
+        } for hit in hits[:count]]
 
         print(f"   ✓ Fetched {len(stories)} stories from Hacker News")
         return stories
@@ -89,9 +147,7 @@ def fetch_devto_articles(count: int = 10) -> List[Dict]:
             'tag': 'ai,saas,product'
         }
 
-        response = requests.get(DEV_TO_API, params=params, timeout=10)
-        response.raise_for_status()
-        articles = response.json()
+        articles = cached_get_json(SESSION, DEV_TO_API, DEVTO_CACHE_TTL, params=params)
 
         stories = []
         for article in articles[:count]:
@@ -111,6 +167,55 @@ def fetch_devto_articles(count: int = 10) -> List[Dict]:
         return []
 
 
+def select_trends_for_prompt(trends: List[Dict], limit: int = PROMPT_TREND_LIMIT) -> List[Dict]:
+    """
+    Rank trends per source by engagement and interleave the sources, keeping the top `limit`.
+
+    Args:
+        trends: Combined Hacker News and Dev.to trend items
+
+    Returns:
+        The highest-signal trends, alternating between sources
+    """
+    hn = sorted((t for t in trends if t['source'] == 'Hacker News'),
+                key=lambda t: t.get('score', 0), reverse=True)
+    devto = sorted((t for t in trends if t['source'] != 'Hacker News'),
+                   key=lambda t: t.get('positive_reactions_count', 0), reverse=True)
+    interleaved = [t for t in chain.from_iterable(zip_longest(hn, devto)) if t is not None]
+    return interleaved[:limit]
+
+
+def _idea_cache_path(trends: List[Dict]) -> Path:
+    """Idea cache file for a set of trends, keyed by their titles."""
+    key = hashlib.sha1("|".join(sorted(t.get('title') or '' for t in trends)).encode()).hexdigest()
+    return CACHE_DIR / f"idea-{key}.json"
+
+
+def _read_idea_cache(trends: List[Dict]) -> Optional[Dict]:
+    """
+    Cached analysis of these trends, if younger than IDEA_CACHE_TTL.
+
+    Returns:
+        {'result': <Claude's answer>, 'issued': bool}, or None on a miss
+    """
+    cache_path = _idea_cache_path(trends)
+    try:
+        if time.time() - cache_path.stat().st_mtime >= IDEA_CACHE_TTL:
+            return None
+        entry = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get('result'), dict):
+        return None
+    return entry
+
+
+def _write_idea_cache(trends: List[Dict], result: Dict, issued: bool):
+    """Record an analysis of these trends and whether its issue was filed."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    _idea_cache_path(trends).write_text(json.dumps({'result': result, 'issued': issued}))
+
+
 def analyze_trends_with_claude(trends: List[Dict]) -> Optional[Dict]:
     """
     Send trends to Claude for analysis and idea extraction.
@@ -123,19 +228,39 @@ def analyze_trends_with_claude(trends: List[Dict]) -> Optional[Dict]:
     """
     print("\n🤖 Analyzing trends with Claude...")
 
+    if len(trends) < MIN_TRENDS or sum(len(t.get('title') or '') for t in trends) < MIN_TREND_CHARS:
+        print(f"   ℹ️  Too little trend signal ({len(trends)} items), skipping analysis")
+        return None
+
+    # The same front page seen again within the TTL was already analyzed: reuse
+    # that answer instead of calling Claude, and only skip an idea once its
+    # issue has actually been filed
+    previous = _read_idea_cache(trends)
+    if previous is not None:
+        result = previous['result']
+        if not result.get("found"):
+            print("   ⚡ Trends unchanged since last analysis (no idea), skipping")
+            return None
+        if previous.get('issued'):
+            print(f"   ⚡ Trends unchanged since last analysis ({result.get('idea_name')}), already filed, skipping")
+            return None
+        print(f"   ⚡ Trends unchanged since last analysis, reusing unfiled idea: {result.get('idea_name')}")
+        return result
+
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         print("   ✗ Error: ANTHROPIC_API_KEY not found in environment")
         return None
 
     try:
-        client = Anthropic(api_key=api_key)
-
-        # Format trends for Claude
-        trends_text = "\n\n".join([
-            f"**{i+1}. {trend['title']}** (Source: {trend['source']})\n"
-            f"URL: {trend['url']}"
-            for i, trend in enumerate(trends)
+        client = _claude()
+
+        # Format the top-ranked trends for Claude; titles are shortened and
+        # URLs reduced to their domain to keep the prompt small
+        trends_text = "\n".join([
+            f"**{i+1}. {textwrap.shorten(trend['title'], width=PROMPT_TITLE_WIDTH, placeholder='…')}** "
+            f"(Source: {trend['source']}, {urlparse(trend['url']).netloc or 'n/a'})"
+            for i, trend in enumerate(select_trends_for_prompt(trends))
         ])
 
         prompt = f"""Analyze these trending topics from Hacker News and Dev.to:
@@ -166,25 +291,21 @@ If no good ideas are found, respond with:
 
 Respond ONLY with the JSON object, no other text."""
 
-        response = client.messages.create(
+        with client.messages.stream(
             model="claude-sonnet-4-5-20250929",
             max_tokens=1000,
             messages=[{
                 "role": "user",
                 "content": prompt
             }]
-        )
-
-        # Parse Claude's response
-        response_text = response.content[0].text.strip()
+        ) as stream:
+            response_text = "".join(stream.text_stream)
 
-        # Extract JSON from response (in case Claude adds explanation)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+        # Extract JSON from response (in case Claude adds explanation or fences)
+        result = json.loads(extract_json_object(response_text))
 
-        result = json.loads(response_text)
+        # Recorded as unfiled; main() marks it issued once the issue exists
+        _write_idea_cache(trends, result, issued=False)
 
         if result.get("found"):
             print(f"   ✓ Found idea: {result['idea_name']}")
@@ -251,7 +372,7 @@ def create_github_issue(idea: Dict) -> bool:
             "labels": ["trend-hunter", "market-research", "enhancement"]
         }
 
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = SESSION.post(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
 
         issue_data = response.json()
@@ -273,9 +394,12 @@ def main():
     print("=" * 70)
 
     try:
-        # Fetch trends from multiple sources
-        hn_stories = fetch_hacker_news_stories(count=10)
-        devto_articles = fetch_devto_articles(count=10)
+        # Fetch trends from multiple sources concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hn_future = executor.submit(fetch_hacker_news_stories, count=10)
+            devto_future = executor.submit(fetch_devto_articles, count=10)
+            hn_stories = hn_future.result()
+            devto_articles = devto_future.result()
 
         # Combine all trends
         all_trends = hn_stories + devto_articles
@@ -294,6 +418,7 @@ def main():
             success = create_github_issue(idea)
 
             if success:
+                _write_idea_cache(all_trends, idea, issued=True)
                 print("\n✅ Trend Hunter completed successfully!")
                 return 0
             else:
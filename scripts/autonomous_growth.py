@@ -4,15 +4,25 @@ Autonomous Growth Engine
 Generates 4 new product repositories per day based on System Architect Configuration.
 """
 
+import io
 import os
+import base64
 import sys
 import json
+import shutil
 import yaml
+import functools
 import subprocess
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from agents.agent_common import extract_json_object
+
 try:
     from anthropic import Anthropic
 except ImportError:
@@ -20,6 +30,55 @@ except ImportError:
     print("Please run: pip install anthropic")
     sys.exit(1)
 
+# Concurrent product pipelines share a cap on simultaneous GitHub create/clone/push
+# operations; GitHub throttles bursts of parallel pushes from one token
+GITHUB_REMOTE_CONCURRENCY = 2
+
+# Transient Claude errors are retried by the SDK, not by burning a product attempt
+CLAUDE_MAX_RETRIES = 3
+
+GITHUB_API_URL = "https://api.github.com"
+TEMPLATE_REPO = "abiolaogu/factory-template"
+# Template generation is asynchronous on GitHub's side; retry the clone briefly
+CLONE_ATTEMPTS = 3
+CLONE_RETRY_DELAY = 2
+
+FILE_WRITE_WORKERS = 8
+
+DASHBOARD_HEADER = """# Growth Dashboard
+
+This dashboard tracks the autonomous generation of new repositories and daily refactoring actions.
+
+## Overview
+
+The Growth Engine operates in two modes:
+
+1. **Creator Engine** (4 AM daily): Generates 4 new product repositories based on research insights
+2. **Janitor Engine** (6 AM daily): Performs daily refactoring on existing repositories
+
+"""
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_text(path: str) -> str:
+    """Read a run-invariant input file once per process."""
+    return Path(path).read_text()
+
+
+def _name_taken(response: requests.Response) -> bool:
+    """Whether a 422 from the generate endpoint means the repo name is taken."""
+    try:
+        errors = response.json().get('errors') or []
+    except ValueError:
+        return False
+    # Entries are plain strings or {"message": ...} objects
+    messages = [e if isinstance(e, str) else str(e.get('message', '')) for e in errors]
+    return any('already exists' in m.lower() for m in messages)
+
 
 class AutonomousGrowthEngine:
     """Orchestrates autonomous product creation."""
@@ -36,8 +95,22 @@ class AutonomousGrowthEngine:
         if not self.github_token:
             raise ValueError("FACTORY_ADMIN_TOKEN environment variable not set")
 
-        self.client = Anthropic(api_key=self.anthropic_key)
+        self.client = Anthropic(api_key=self.anthropic_key, max_retries=CLAUDE_MAX_RETRIES)
         self.created_repos = []
+        # Child process environment, built once rather than copied per subprocess
+        # Authenticate clone/push through per-process git config in the
+        # environment, so the token never lands in a remote URL in .git/config
+        # or in the process list
+        basic = base64.b64encode(f"x-access-token:{self.github_token}".encode()).decode()
+        self._git_env = {
+            **os.environ,
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': 'http.https://github.com/.extraheader',
+            'GIT_CONFIG_VALUE_0': f"AUTHORIZATION: basic {basic}",
+        }
+        # Products are created concurrently; serialize manifest read-modify-write
+        self._manifest_lock = threading.Lock()
+        self._remote_slots = threading.BoundedSemaphore(GITHUB_REMOTE_CONCURRENCY)
 
     def read_research_insights(self) -> Dict:
         """Read latest research insights from daily briefing."""
@@ -54,8 +127,7 @@ class AutonomousGrowthEngine:
         }
 
         if briefing_path.exists():
-            with open(briefing_path, 'r') as f:
-                insights['daily_briefing'] = f.read()
+            insights['daily_briefing'] = _read_text(str(briefing_path))
             print(f"   ✓ Read daily briefing ({len(insights['daily_briefing'])} chars)")
         else:
             print("   ⚠️  No daily briefing found")
@@ -76,7 +148,7 @@ class AutonomousGrowthEngine:
 
         if manifest_path.exists():
             with open(manifest_path, 'r') as f:
-                index['manifest'] = yaml.safe_load(f) or {}
+                index['manifest'] = yaml.load(f, Loader=YAML_LOADER) or {}
             print(f"   ✓ Read manifest with {len(index['manifest'].get('components', []))} components")
 
         return index
@@ -93,8 +165,7 @@ class AutonomousGrowthEngine:
             print("Please create config/system_architect.txt first.")
             return None
 
-        with open(config_path, 'r') as f:
-            system_prompt = f.read()
+        system_prompt = _read_text(str(config_path))
 
         # 2. ADD TIME CONTEXT (To ensure freshness)
         current_time = datetime.now().isoformat()
@@ -109,30 +180,20 @@ class AutonomousGrowthEngine:
             user_context += f"Available Market Context: {insights.get('daily_briefing', 'None')[:500]}...\n"
             user_context += "Go."
 
-            message = self.client.messages.create(
+            with self.client.messages.stream(
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=4000,
                 system=system_prompt,  # <--- HARDWIRED BRAIN
                 messages=[
                     {"role": "user", "content": user_context}
                 ]
-            )
-
-            response_text = message.content[0].text.strip()
-
-            # Extract JSON from response
-            if '```json' in response_text:
-                json_start = response_text.find('```json') + 7
-                json_end = response_text.find('```', json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif '```' in response_text:
-                json_start = response_text.find('```') + 3
-                json_end = response_text.find('```', json_start)
-                response_text = response_text[json_start:json_end].strip()
+            ) as stream:
+                response_text = "".join(stream.text_stream)
 
             # The System Architect returns a structure with "repo_name" and "files"
-            # We map this to the format expected by the rest of the script
-            architect_output = json.loads(response_text)
+            # We map this to the format expected by the rest of the script.
+            # File contents may embed ``` fences, so slice by brace depth, not fences.
+            architect_output = json.loads(extract_json_object(response_text))
             
             # Normalize output to match expected internal dictionary
             product_idea = {
@@ -168,10 +229,21 @@ class AutonomousGrowthEngine:
             print(f"\n📝 Using Architect-defined scaffolding for {product_idea['name']}...")
             files = product_idea['generated_files']
             
+            # Single pass; each slot keeps the first matching file
+            readme = prd = architecture = None
+            for f in files:
+                path = f['path']
+                if readme is None and path == 'README.md':
+                    readme = f['content']
+                if prd is None and ('PRD' in path or 'domain' in path):
+                    prd = f['content']
+                if architecture is None and 'ARCHITECTURE' in path:
+                    architecture = f['content']
+
             docs = {
-                'readme': next((f['content'] for f in files if f['path'] == 'README.md'), "# Readme"),
-                'prd': next((f['content'] for f in files if 'PRD' in f['path'] or 'domain' in f['path']), "# Logic"),
-                'architecture': next((f['content'] for f in files if 'ARCHITECTURE' in f['path']), "# Architecture"),
+                'readme': readme if readme is not None else "# Readme",
+                'prd': prd if prd is not None else "# Logic",
+                'architecture': architecture if architecture is not None else "# Architecture",
                 'all_files': files # Pass all files through
             }
             return docs
@@ -184,7 +256,7 @@ class AutonomousGrowthEngine:
         return {'readme': '# Error', 'prd': 'Error', 'architecture': 'Error'}
 
     def create_repository(self, product_idea: Dict, docs: Dict) -> Optional[str]:
-        """Create a new GitHub repository using gh CLI."""
+        """Create a new GitHub repository from the factory template."""
         print(f"\n🏗️  Creating repository for {product_idea['name']}...")
 
         # Generate repo name (lowercase, hyphenated)
@@ -192,66 +264,61 @@ class AutonomousGrowthEngine:
         full_repo_name = f"{self.github_owner}/{repo_name}"
 
         try:
-            # Check if repo already exists
-            check_cmd = ['gh', 'repo', 'view', full_repo_name]
-            result = subprocess.run(check_cmd, capture_output=True, text=True, env={
-                **os.environ,
-                'GH_TOKEN': self.github_token
-            })
-
-            if result.returncode == 0:
+            # Create repository from factory-template in one REST call; a 422
+            # saying the name exists replaces a separate `gh repo view` check
+            with self._remote_slots:
+                response = requests.post(
+                    f"{GITHUB_API_URL}/repos/{TEMPLATE_REPO}/generate",
+                    headers={
+                        "Authorization": f"token {self.github_token}",
+                        "Accept": "application/vnd.github+json"
+                    },
+                    json={"owner": self.github_owner, "name": repo_name, "private": True},
+                    timeout=30
+                )
+
+            if response.status_code == 422 and _name_taken(response):
                 print(f"   ⚠️  Repository {full_repo_name} already exists, skipping")
                 return None
-
-            # Create repository from factory-template
-            create_cmd = [
-                'gh', 'repo', 'create', full_repo_name,
-                '--template', 'abiolaogu/factory-template',
-                '--private',
-                '--clone'
-            ]
-
-            result = subprocess.run(create_cmd, capture_output=True, text=True, cwd=self.base_path, env={
-                **os.environ,
-                'GH_TOKEN': self.github_token
-            })
-
-            if result.returncode != 0:
-                print(f"   ✗ Failed to create repository: {result.stderr}")
+            if response.status_code != 201:
+                print(f"   ✗ Failed to create repository: {response.status_code} {response.text}")
                 return None
 
             print(f"   ✓ Created repository: {full_repo_name}")
 
-            # Clone and add documentation/files
+            # Shallow clone: only the template tip is needed to commit on top of it
             repo_dir = self.base_path / repo_name
+            if not self._clone_generated_repo(full_repo_name, repo_dir):
+                print(f"   ✗ Failed to clone {full_repo_name}")
+                return None
 
-            if repo_dir.exists():
-                # Write files provided by System Architect
-                if 'all_files' in docs:
-                    for file_obj in docs['all_files']:
-                        file_path = repo_dir / file_obj['path']
-                        # Ensure directory exists
-                        file_path.parent.mkdir(parents=True, exist_ok=True)
-                        file_path.write_text(file_obj['content'])
-                        print(f"   ✓ Wrote {file_obj['path']}")
-                else:
-                    # Fallback for standard docs
-                    (repo_dir / 'README.md').write_text(docs['readme'])
-                    (repo_dir / 'docs' / 'PRD.md').write_text(docs['prd'])
-                    (repo_dir / 'docs' / 'ARCHITECTURE.md').write_text(docs['architecture'])
-
-                # Commit and push
-                subprocess.run(['git', 'add', '.'], cwd=repo_dir, check=True)
-                subprocess.run([
-                    'git', 'commit', '-m',
-                    f"feat: initialize {product_idea['name']} via System Architect\n\nCompliant with Factory Constitution v2.0"
-                ], cwd=repo_dir, check=True)
-                subprocess.run(['git', 'push'], cwd=repo_dir, check=True, env={
-                    **os.environ,
-                    'GH_TOKEN': self.github_token
-                })
-
-                print(f"   ✓ Pushed initial scaffolding")
+            # Write files provided by System Architect
+            if 'all_files' in docs:
+                files = docs['all_files']
+                # Create each distinct directory once, then write files in parallel
+                for parent in {(repo_dir / f['path']).parent for f in files}:
+                    parent.mkdir(parents=True, exist_ok=True)
+                with ThreadPoolExecutor(max_workers=FILE_WRITE_WORKERS) as executor:
+                    list(executor.map(lambda f: (repo_dir / f['path']).write_text(f['content']), files))
+                print(f"   ✓ Wrote {len(files)} files")
+            else:
+                # Fallback for standard docs
+                (repo_dir / 'README.md').write_text(docs['readme'])
+                (repo_dir / 'docs' / 'PRD.md').write_text(docs['prd'])
+                (repo_dir / 'docs' / 'ARCHITECTURE.md').write_text(docs['architecture'])
+
+            # Commit and push; flush first so git's output lands after ours
+            sys.stdout.flush()
+            subprocess.run(['git', 'add', '.'], cwd=repo_dir, check=True, stdin=subprocess.DEVNULL)
+            subprocess.run([
+                'git', 'commit', '-m',
+                f"feat: initialize {product_idea['name']} via System Architect\n\nCompliant with Factory Constitution v2.0"
+            ], cwd=repo_dir, check=True, stdin=subprocess.DEVNULL)
+            with self._remote_slots:
+                subprocess.run(['git', 'push'], cwd=repo_dir, check=True, env=self._git_env,
+                               stdin=subprocess.DEVNULL)
+
+            print(f"   ✓ Pushed initial scaffolding")
 
             return f"https://github.com/{full_repo_name}"
 
@@ -259,17 +326,54 @@ class AutonomousGrowthEngine:
             print(f"   ✗ Error creating repository: {e}")
             return None
 
+    def _clone_generated_repo(self, full_repo_name: str, repo_dir: Path) -> bool:
+        """
+        Shallow-clone a freshly generated repo, waiting for the template commit to land.
+
+        Refuses an existing repo_dir: the name is only known to be free on
+        GitHub, and it may match a directory of this checkout (e.g. `scripts`).
+        Only a directory left by one of this method's own attempts is removed.
+        """
+        if repo_dir.exists():
+            print(f"   ✗ {repo_dir} already exists locally, not cloning over it")
+            return False
+
+        remote = f"https://github.com/{full_repo_name}.git"
+
+        for attempt in range(CLONE_ATTEMPTS):
+            if attempt:
+                time.sleep(CLONE_RETRY_DELAY)
+                shutil.rmtree(repo_dir, ignore_errors=True)
+            with self._remote_slots:
+                result = subprocess.run(['git', 'clone', '--depth', '1', remote, str(repo_dir)],
+                                        capture_output=True, text=True, env=self._git_env,
+                                        stdin=subprocess.DEVNULL)
+            if result.returncode != 0:
+                continue
+            # An empty clone means GitHub hasn't finished copying the template yet
+            head = subprocess.run(['git', 'rev-parse', '--verify', 'HEAD'],
+                                  cwd=repo_dir, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+            if head.returncode == 0:
+                return True
+
+        return False
+
     def register_repository(self, product_idea: Dict, repo_url: str):
         """Add the new repository to the manifest."""
         print(f"\n📋 Registering repository in manifest...")
 
         manifest_path = self.base_path / '.repo-index' / 'manifest.yaml'
 
+        with self._manifest_lock:
+            self._append_to_manifest(manifest_path, product_idea, repo_url)
+
+    def _append_to_manifest(self, manifest_path: Path, product_idea: Dict, repo_url: str):
+        """Append one repository entry to the manifest on disk."""
         try:
             # Read existing manifest
             if manifest_path.exists():
                 with open(manifest_path, 'r') as f:
-                    manifest = yaml.safe_load(f) or {}
+                    manifest = yaml.load(f, Loader=YAML_LOADER) or {}
             else:
                 manifest = {'components': []}
 
@@ -286,7 +390,7 @@ class AutonomousGrowthEngine:
             # Write updated manifest
             manifest_path.parent.mkdir(parents=True, exist_ok=True)
             with open(manifest_path, 'w') as f:
-                yaml.dump(manifest, f, default_flow_style=False)
+                yaml.dump(manifest, f, Dumper=YAML_DUMPER, default_flow_style=False)
 
             print(f"   ✓ Registered in manifest")
 
@@ -344,11 +448,14 @@ class AutonomousGrowthEngine:
         attempts = 0
         max_attempts = target_count * 3  # Allow up to 3 attempts per target
 
-        while len(created) < target_count and attempts < max_attempts:
-            attempts += 1
-            result = self.create_product(insights, repo_index, attempts)
-            if result:
-                created.append(result)
+        # Products are independent, so each round runs one attempt per missing
+        # product concurrently until the target is met or attempts run out
+        with ThreadPoolExecutor(max_workers=target_count) as executor:
+            while len(created) < target_count and attempts < max_attempts:
+                batch = range(attempts + 1, min(attempts + target_count - len(created), max_attempts) + 1)
+                attempts += len(batch)
+                results = executor.map(lambda n: self.create_product(insights, repo_index, n), batch)
+                created.extend(result for result in results if result)
 
         print("\n" + "=" * 60)
         print(f"✅ CREATOR ENGINE - COMPLETE")
@@ -401,64 +508,53 @@ def update_dashboard(dashboard_path: Path, created_repos: List[Dict], refactor_p
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     date_str = datetime.now().strftime('%Y-%m-%d')
 
-    # Generate new entry
-    entry = f"\n\n---\n\n## Growth Report: {date_str}\n"
-    entry += f"**Generated:** {timestamp}\n\n"
+    # Generate new entry into a single buffer
+    buf = io.StringIO()
+    w = buf.write
+    w(f"\n\n---\n\n## Growth Report: {date_str}\n**Generated:** {timestamp}\n\n")
 
     # Created repositories
-    entry += "### Today's Output (Creator Engine)\n\n"
+    w("### Today's Output (Creator Engine)\n\n")
     if created_repos:
         for i, repo in enumerate(created_repos, 1):
-            entry += f"{i}. **{repo['product']['name']}** - {repo['product']['description']}\n"
-            entry += f"   - URL: [{repo['url']}]({repo['url']})\n"
-            entry += f"   - Source: {repo['product']['source']}\n"
-            entry += f"   - Confidence: {repo['product']['confidence_score']}/100\n"
-            tech_items = [f"{k}: {v}" for k, v in repo['product'].get('tech_stack', {}).items()]
-            entry += f"   - Tech Stack: {', '.join(tech_items)}\n\n"
+            product = repo['product']
+            tech_items = ', '.join(f"{k}: {v}" for k, v in product.get('tech_stack', {}).items())
+            w(f"{i}. **{product['name']}** - {product['description']}\n"
+              f"   - URL: [{repo['url']}]({repo['url']})\n"
+              f"   - Source: {product['source']}\n"
+              f"   - Confidence: {product['confidence_score']}/100\n"
+              f"   - Tech Stack: {tech_items}\n\n")
     else:
-        entry += "*No repositories created today*\n\n"
+        w("*No repositories created today*\n\n")
 
     # Refactor actions
-    entry += "### Refactor Actions (Janitor Engine)\n\n"
+    w("### Refactor Actions (Janitor Engine)\n\n")
     if refactor_prs:
         for i, pr in enumerate(refactor_prs, 1):
-            entry += f"{i}. **{pr['title']}**\n"
-            entry += f"   - PR: [{pr['url']}]({pr['url']})\n"
-            entry += f"   - Repository: {pr['repo']}\n"
-            entry += f"   - Type: {pr['type']}\n\n"
+            w(f"{i}. **{pr['title']}**\n"
+              f"   - PR: [{pr['url']}]({pr['url']})\n"
+              f"   - Repository: {pr['repo']}\n"
+              f"   - Type: {pr['type']}\n\n")
     else:
-        entry += "*No refactoring actions today*\n\n"
+        w("*No refactoring actions today*\n\n")
 
     # Reuse metrics
-    entry += "### Reuse Metrics\n\n"
     total_reused = sum(len(repo['product'].get('reusable_components', [])) for repo in created_repos)
-    entry += f"- **Components Reused:** {total_reused}\n"
-    entry += f"- **Net New Repositories:** {len(created_repos)}\n"
+    w("### Reuse Metrics\n\n"
+      f"- **Components Reused:** {total_reused}\n"
+      f"- **Net New Repositories:** {len(created_repos)}\n")
+    entry = buf.getvalue()
 
     try:
-        # Read existing content
+        # Entries are strictly appended, so only the new entry is written;
+        # the header is written once when the dashboard is first created
+        dashboard_path.parent.mkdir(parents=True, exist_ok=True)
         if dashboard_path.exists():
-            with open(dashboard_path, 'r') as f:
-                existing_content = f.read()
+            with open(dashboard_path, 'a') as f:
+                f.write(entry)
         else:
-            # Create initial content
-            existing_content = """# Growth Dashboard
-
-This dashboard tracks the autonomous generation of new repositories and daily refactoring actions.
-
-## Overview
-
-The Growth Engine operates in two modes:
-
-1. **Creator Engine** (4 AM daily): Generates 4 new product repositories based on research insights
-2. **Janitor Engine** (6 AM daily): Performs daily refactoring on existing repositories
-
-"""
-
-        # Append new entry
-        dashboard_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(dashboard_path, 'w') as f:
-            f.write(existing_content + entry)
+            with open(dashboard_path, 'w') as f:
+                f.write(DASHBOARD_HEADER + entry)
 
         print(f"   ✓ Dashboard updated")
 
@@ -7,8 +7,16 @@ Performs daily refactoring on existing repositories to maintain quality.
 import os
 import sys
 import json
+import time
+import heapq
+import functools
+import argparse
 import yaml
+import requests
+import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, MISSING
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -20,6 +28,116 @@ except ImportError:
     print("Please run: pip install anthropic")
     sys.exit(1)
 
+# Claude replies are parsed with orjson when it's installed (optional, faster)
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Concurrent Claude analyses; the SDK retries 429/5xx with backoff
+ANALYSIS_WORKERS = 8
+CLAUDE_MAX_RETRIES = 3
+
+# Repositories packed into a single Claude request, sharing one system prompt
+ANALYSIS_BATCH_SIZE = 5
+PLAN_MAX_TOKENS = 1500
+
+# Message Batches polling (seconds): exponential backoff, give up well inside the CI job limit
+BATCH_POLL_INITIAL = 10
+BATCH_POLL_MAX = 300
+BATCH_POLL_TIMEOUT = 3 * 60 * 60
+
+# Concurrent repository clones before refactors are applied
+CLONE_WORKERS = 4
+
+# Quality scores are reused for 24h while a repo's HEAD commit is unchanged
+QUALITY_CACHE_TTL = 24 * 60 * 60
+SHA_LOOKUP_WORKERS = 8
+
+GITHUB_API_URL = "https://api.github.com"
+
+# libyaml's C loader when available, else the pure-Python one
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Compliance prompt used when config/janitor_compliance.txt is missing
+_FALLBACK_PROMPT = """You are an autonomous code refactoring system following the "Holy Trinity" principles:
+1. Extreme Programming (XP) - TDD, Pair Programming, Continuous Integration
+2. Domain-Driven Design (DDD) - Bounded Contexts, Ubiquitous Language
+3. Test-Driven Development (TDD) - Tests first, refactor with confidence
+
+COMPLIANCE MANDATE: Non-Disruptive Refactoring Only
+- NDPR/GDPR: Ensure data handling remains compliant
+- SOC2: Maintain audit logging and access controls
+- Security: Never introduce vulnerabilities
+
+TASK: Identify ONE high-impact refactoring opportunity that would:
+1. Improve code quality (reduce duplication, improve testability)
+2. Align with Holy Trinity principles (DDD/XP/TDD)
+3. Be low-risk (Tier 0 or Tier 1) - NO breaking changes
+4. Maintain or improve compliance posture
+
+Common refactoring patterns to consider:
+- Extract duplicate JWT logic to shared library
+- Update deprecated API calls (security patches)
+- Convert callback hell to async/await (readability)
+- Extract domain logic from controllers (DDD alignment)
+- Add missing unit tests for critical paths (TDD)
+- Consolidate similar components (DRY principle)
+- Improve error handling and logging (SOC2)
+
+OUTPUT FORMAT (JSON):
+{
+  "refactor_type": "extract_library" | "update_deprecated" | "improve_tests" | "architecture_alignment" | "compliance_hardening",
+  "title": "Brief title for the refactoring",
+  "description": "Detailed description of what needs to be done",
+  "estimated_risk": "tier_0" | "tier_1",
+  "impact": "High" | "Medium" | "Low",
+  "rationale": "Why this refactoring is valuable (focus on compliance/quality)",
+  "files_affected": ["path/to/file1", "path/to/file2"]
+}
+
+Respond with ONLY the JSON, no other text."""
+
+# Dashboard markers: each report starts with a dated header and contains one
+# refactor subsection, which runs until the next subsection or entry separator
+_REPORT_PREFIX = "## Growth Report: "
+_REFACTOR_HEADER = "### Refactor Actions (Janitor Engine)\n"
+
+
+@dataclass
+class RefactorPlan:
+    """A refactoring plan as returned by Claude (see the compliance prompt's OUTPUT FORMAT)."""
+    refactor_type: str
+    title: str
+    description: str
+    estimated_risk: str
+    impact: str
+    rationale: str
+    files_affected: List[str]
+    compliance_benefit: str = ''
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RefactorPlan':
+        """Build a plan from decoded JSON; raises ValueError if it's incomplete or malformed."""
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+
+        required = [f.name for f in fields(cls) if f.default is MISSING]
+        missing = [name for name in required if name not in data]
+        if missing:
+            raise ValueError(f"plan is missing {', '.join(missing)}")
+        if not isinstance(data['files_affected'], list):
+            raise ValueError("files_affected must be a list")
+
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_created(created: str) -> datetime:
+    """Naive datetime for a manifest `created` timestamp; fromisoformat only accepts
+    a trailing Z from Python 3.11, and the janitor supports 3.10+."""
+    return datetime.fromisoformat(created.replace('Z', '+00:00')).replace(tzinfo=None)
+
 
 class AutonomousJanitorEngine:
     """Orchestrates autonomous refactoring."""
@@ -36,42 +154,136 @@ class AutonomousJanitorEngine:
         if not self.github_token:
             raise ValueError("FACTORY_ADMIN_TOKEN environment variable not set")
 
-        self.client = Anthropic(api_key=self.anthropic_key)
+        self.client = Anthropic(api_key=self.anthropic_key, max_retries=CLAUDE_MAX_RETRIES)
         self.refactor_prs = []
-
-    def scan_repositories(self) -> List[Dict]:
-        """Scan all repositories and calculate quality scores."""
+        # Child process environment, built once rather than copied per subprocess
+        self._gh_env = {**os.environ, 'GH_TOKEN': self.github_token}
+        self._manifest = None
+        self._manifest_loaded = False
+
+        # READ THE COMPLIANCE BRAIN once; it's marked cacheable so every analysis
+        # after the first reuses Anthropic's cached prefix instead of re-sending it
+        self._system_prompt = [{
+            "type": "text",
+            "text": self._load_system_prompt(),
+            "cache_control": {"type": "ephemeral"},
+        }]
+
+    @property
+    def manifest(self) -> Optional[Dict]:
+        """Parsed repository manifest, loaded once on first use; None if it doesn't exist."""
+        if not self._manifest_loaded:
+            manifest_path = self.base_path / '.repo-index' / 'manifest.yaml'
+            if manifest_path.exists():
+                with open(manifest_path, 'r') as f:
+                    self._manifest = yaml.load(f, Loader=YAML_LOADER) or {}
+            self._manifest_loaded = True
+        return self._manifest
+
+    def scan_repositories(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Scan all repositories and calculate quality scores.
+
+        Returns repos lowest-score first; with a limit, only the `limit` lowest.
+        """
         print("🔍 Scanning repositories for quality scores...")
 
-        manifest_path = self.base_path / '.repo-index' / 'manifest.yaml'
+        manifest = self.manifest
 
-        if not manifest_path.exists():
+        if manifest is None:
             print("   ⚠️  No repository manifest found")
             return []
 
-        with open(manifest_path, 'r') as f:
-            manifest = yaml.safe_load(f) or {}
-
         repos = manifest.get('components', [])
         print(f"   ✓ Found {len(repos)} repositories in manifest")
 
-        # Analyze each repository
+        # Look up every repo's HEAD commit concurrently; scores cached for an
+        # unchanged commit are reused instead of recomputed
+        if repos:
+            with ThreadPoolExecutor(max_workers=min(SHA_LOOKUP_WORKERS, len(repos))) as executor:
+                head_shas = list(executor.map(self._head_sha, repos))
+        else:
+            head_shas = []
+        cache = self._load_quality_cache()
+
+        # Analyze each repository against a single reference time; per-repo
+        # lines are collected and written once for the whole phase
+        now = datetime.now()
         scored_repos = []
-        for repo in repos:
+        lines = []
+        for repo, sha in zip(repos, head_shas):
             try:
-                score = self.calculate_quality_score(repo)
+                key = f"{repo.get('url')}@{sha}" if sha else None
+                cached = cache.get(key) if key else None
+                if cached and now.timestamp() - cached['computed_at'] < QUALITY_CACHE_TTL:
+                    score = cached['score']
+                else:
+                    score = self.calculate_quality_score(repo, now)
+                    if key:
+                        cache[key] = {'score': score, 'computed_at': now.timestamp()}
                 scored_repos.append({
                     'repo': repo,
                     'quality_score': score
                 })
-                print(f"   - {repo['name']}: {score}/100")
+                lines.append(f"   - {repo['name']}: {score}/100")
             except Exception as e:
-                print(f"   ✗ Error analyzing {repo.get('name', 'unknown')}: {e}")
+                lines.append(f"   ✗ Error analyzing {repo.get('name', 'unknown')}: {e}")
+
+        if lines:
+            print("\n".join(lines))
+        sys.stdout.flush()
+
+        self._save_quality_cache(cache, now)
 
-        return sorted(scored_repos, key=lambda x: x['quality_score'])
+        if limit is None:
+            return sorted(scored_repos, key=lambda x: x['quality_score'])
+        return heapq.nsmallest(limit, scored_repos, key=lambda x: x['quality_score'])
 
-    def calculate_quality_score(self, repo: Dict) -> int:
-        """Calculate a quality score for a repository."""
+    def _head_sha(self, repo: Dict) -> Optional[str]:
+        """Latest commit SHA of a manifest repo's default branch, or None if unavailable."""
+        repo_name = repo.get('url', '').rstrip('/').split('/')[-1]
+        if not repo_name:
+            return None
+
+        try:
+            response = requests.get(
+                f"{GITHUB_API_URL}/repos/{self.github_owner}/{repo_name}/commits/HEAD",
+                headers={
+                    "Authorization": f"token {self.github_token}",
+                    "Accept": "application/vnd.github.sha"
+                },
+                timeout=15
+            )
+        except requests.RequestException:
+            return None
+
+        return response.text.strip() if response.status_code == 200 else None
+
+    def _load_quality_cache(self) -> Dict:
+        """Cached quality scores keyed by url@sha; empty if missing or unreadable."""
+        cache_path = self.base_path / '.repo-index' / 'quality_cache.json'
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_quality_cache(self, cache: Dict, now: datetime):
+        """Write back unexpired cache entries atomically."""
+        cache_path = self.base_path / '.repo-index' / 'quality_cache.json'
+        fresh = {key: entry for key, entry in cache.items()
+                 if now.timestamp() - entry['computed_at'] < QUALITY_CACHE_TTL}
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(fresh, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"   ⚠️  Could not write quality cache: {e}")
+
+    def calculate_quality_score(self, repo: Dict, now: Optional[datetime] = None) -> int:
+        """Calculate a quality score for a repository, as of `now` (default: current time)."""
         # Simulate quality score calculation
         # In production, this would:
         # 1. Clone the repo
@@ -82,146 +294,247 @@ class AutonomousJanitorEngine:
         # 6. Analyze architecture adherence
 
         # For now, use a simple heuristic based on age
-        created = repo.get('created', datetime.now().isoformat())
-        created_date = datetime.fromisoformat(created.replace('Z', '+00:00'))
-        days_old = (datetime.now() - created_date.replace(tzinfo=None)).days
+        now = now or datetime.now()
+        created = repo.get('created')
+        created_date = _parse_created(created) if created else now
+        days_old = (now - created_date).days
 
         # Older repos have lower scores (more likely to need refactoring)
         base_score = max(50, 100 - days_old * 2)
 
         return base_score
 
-    def identify_refactoring_needs(self, repo_info: Dict) -> Optional[Dict]:
-        """Use Claude to identify refactoring needs using hardwired compliance prompt."""
-        repo = repo_info['repo']
-        quality_score = repo_info['quality_score']
-
-        print(f"\n🔧 Analyzing {repo['name']} (score: {quality_score}/100)...")
-
-        # READ THE COMPLIANCE BRAIN (Hardwired System Prompt for Janitor)
+    def _load_system_prompt(self) -> str:
+        """Read the hardwired compliance prompt, or the fallback if it's missing."""
         config_path = self.base_path / 'config' / 'janitor_compliance.txt'
 
         if not config_path.exists():
             print(f"   ⚠️  Compliance config not found, using fallback prompt")
-            system_prompt = self._get_fallback_compliance_prompt()
-        else:
-            with open(config_path, 'r') as f:
-                system_prompt = f.read()
+            return _FALLBACK_PROMPT
 
-        # Build user context with repository-specific information
-        user_context = f"""REPOSITORY INFO:
+        with open(config_path, 'r') as f:
+            return f.read()
+
+    def _format_repo_info(self, repo_info: Dict) -> str:
+        """Render the repository-specific context sent to Claude."""
+        repo = repo_info['repo']
+        return f"""REPOSITORY INFO:
 - Name: {repo['name']}
 - Description: {repo.get('description', 'N/A')}
 - Tech Stack: {json.dumps(repo.get('tech_stack', {}), indent=2)}
-- Quality Score: {quality_score}/100
-- Reusable Components: {repo.get('reusable_components', [])}
+- Quality Score: {repo_info['quality_score']}/100
+- Reusable Components: {repo.get('reusable_components', [])}"""
+
+    def _report_plan(self, refactor_plan: RefactorPlan):
+        print(f"   ✓ Identified: {refactor_plan.title}")
+        print(f"   Type: {refactor_plan.refactor_type}")
+        print(f"   Risk: {refactor_plan.estimated_risk}")
+        print(f"   Impact: {refactor_plan.impact}")
+
+    def _plan_request(self, repo_info: Dict) -> Dict:
+        """Build the Messages API parameters for a single-repo analysis."""
+        # Build user context with repository-specific information
+        user_context = f"""{self._format_repo_info(repo_info)}
 
 Identify ONE high-impact, non-disruptive refactoring opportunity for this repository."""
 
-        try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=1500,
-                system=system_prompt,  # <--- HARDWIRED COMPLIANCE BRAIN
-                messages=[
-                    {"role": "user", "content": user_context}
-                ]
-            )
+        return {
+            "model": "claude-sonnet-4-5-20250929",
+            "max_tokens": PLAN_MAX_TOKENS,
+            "system": self._system_prompt,  # <--- HARDWIRED COMPLIANCE BRAIN (prompt-cached)
+            "messages": [
+                {"role": "user", "content": user_context}
+            ]
+        }
 
-            response_text = message.content[0].text.strip()
+    def _parse_plan(self, repo_info: Dict, response_text: str) -> Dict:
+        """Turn a single-repo analysis reply into a refactor_info dict."""
+        response_text = response_text.strip()
 
-            # Extract JSON
-            if '```json' in response_text:
-                json_start = response_text.find('```json') + 7
-                json_end = response_text.find('```', json_start)
-                response_text = response_text[json_start:json_end].strip()
+        # Extract JSON
+        if '```json' in response_text:
+            json_start = response_text.find('```json') + 7
+            json_end = response_text.find('```', json_start)
+            response_text = response_text[json_start:json_end].strip()
 
-            refactor_plan = json.loads(response_text)
+        refactor_plan = RefactorPlan.from_dict(_loads(response_text))
+        self._report_plan(refactor_plan)
 
-            print(f"   ✓ Identified: {refactor_plan['title']}")
-            print(f"   Type: {refactor_plan['refactor_type']}")
-            print(f"   Risk: {refactor_plan['estimated_risk']}")
-            print(f"   Impact: {refactor_plan['impact']}")
+        return {
+            'repo': repo_info['repo'],
+            'plan': refactor_plan
+        }
 
-            return {
-                'repo': repo,
-                'plan': refactor_plan
-            }
+    def identify_refactoring_needs(self, repo_info: Dict) -> Optional[Dict]:
+        """Use Claude to identify refactoring needs using hardwired compliance prompt."""
+        repo = repo_info['repo']
+        quality_score = repo_info['quality_score']
+
+        print(f"\n🔧 Analyzing {repo['name']} (score: {quality_score}/100)...")
+
+        try:
+            message = self.client.messages.create(**self._plan_request(repo_info))
+            return self._parse_plan(repo_info, message.content[0].text)
 
         except Exception as e:
             print(f"   ✗ Error identifying refactoring: {e}")
             return None
 
-    def _get_fallback_compliance_prompt(self) -> str:
-        """Fallback compliance prompt if config file doesn't exist."""
-        return """You are an autonomous code refactoring system following the "Holy Trinity" principles:
-1. Extreme Programming (XP) - TDD, Pair Programming, Continuous Integration
-2. Domain-Driven Design (DDD) - Bounded Contexts, Ubiquitous Language
-3. Test-Driven Development (TDD) - Tests first, refactor with confidence
+    def identify_refactoring_needs_offline(self, repo_infos: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Identify refactoring needs through the Message Batches API.
 
-COMPLIANCE MANDATE: Non-Disruptive Refactoring Only
-- NDPR/GDPR: Ensure data handling remains compliant
-- SOC2: Maintain audit logging and access controls
-- Security: Never introduce vulnerabilities
+        All analyses are submitted as one batch (half price, no per-request rate
+        limits) and polled with exponential backoff until processing ends. If the
+        batch can't be submitted or doesn't finish in time, falls back to the
+        direct per-request path.
+        """
+        print(f"\n📦 Submitting {len(repo_infos)} analyses as a message batch...")
 
-TASK: Identify ONE high-impact refactoring opportunity that would:
-1. Improve code quality (reduce duplication, improve testability)
-2. Align with Holy Trinity principles (DDD/XP/TDD)
-3. Be low-risk (Tier 0 or Tier 1) - NO breaking changes
-4. Maintain or improve compliance posture
-
-Common refactoring patterns to consider:
-- Extract duplicate JWT logic to shared library
-- Update deprecated API calls (security patches)
-- Convert callback hell to async/await (readability)
-- Extract domain logic from controllers (DDD alignment)
-- Add missing unit tests for critical paths (TDD)
-- Consolidate similar components (DRY principle)
-- Improve error handling and logging (SOC2)
+        try:
+            batch = self.client.messages.batches.create(requests=[
+                {"custom_id": f"repo-{i}", "params": self._plan_request(info)}
+                for i, info in enumerate(repo_infos)
+            ])
+
+            delay = BATCH_POLL_INITIAL
+            deadline = time.monotonic() + BATCH_POLL_TIMEOUT
+            while batch.processing_status != 'ended':
+                if time.monotonic() >= deadline:
+                    self.client.messages.batches.cancel(batch.id)
+                    raise TimeoutError(f"batch {batch.id} still {batch.processing_status}")
+                time.sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX)
+                batch = self.client.messages.batches.retrieve(batch.id)
+
+            print(f"   ✓ Batch {batch.id} ended")
+            replies = {
+                entry.custom_id: entry.result.message.content[0].text
+                for entry in self.client.messages.batches.results(batch.id)
+                if entry.result.type == 'succeeded'
+            }
+        except Exception as e:
+            print(f"   ✗ Message batch failed, falling back to direct calls: {e}")
+            return self._identify_refactoring_needs_direct(repo_infos)
+
+        results = []
+        for i, repo_info in enumerate(repo_infos):
+            repo = repo_info['repo']
+            print(f"\n🔧 {repo['name']} (score: {repo_info['quality_score']}/100)")
+
+            reply = replies.get(f"repo-{i}")
+            if reply is None:
+                print(f"   ✗ No batch result for {repo['name']}")
+                results.append(None)
+                continue
 
-OUTPUT FORMAT (JSON):
-{
-  "refactor_type": "extract_library" | "update_deprecated" | "improve_tests" | "architecture_alignment" | "compliance_hardening",
-  "title": "Brief title for the refactoring",
-  "description": "Detailed description of what needs to be done",
-  "estimated_risk": "tier_0" | "tier_1",
-  "impact": "High" | "Medium" | "Low",
-  "rationale": "Why this refactoring is valuable (focus on compliance/quality)",
-  "files_affected": ["path/to/file1", "path/to/file2"]
-}
+            try:
+                results.append(self._parse_plan(repo_info, reply))
+            except Exception as e:
+                print(f"   ✗ Error identifying refactoring: {e}")
+                results.append(None)
+
+        return results
+
+    def _identify_refactoring_needs_direct(self, repo_infos: List[Dict]) -> List[Optional[Dict]]:
+        """Analyze repos with direct calls, several to a request, batches in parallel."""
+        batches = [repo_infos[i:i + ANALYSIS_BATCH_SIZE]
+                   for i in range(0, len(repo_infos), ANALYSIS_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(ANALYSIS_WORKERS, len(batches))) as executor:
+            return [info for batch in executor.map(self.identify_refactoring_needs_batch, batches)
+                    for info in batch]
+
+    def identify_refactoring_needs_batch(self, repo_infos: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Identify refactoring needs for several repositories in one Claude call.
+
+        The system prompt and request overhead are paid once per batch. Any repo
+        the batched reply doesn't cover with a complete plan falls back to its
+        own identify_refactoring_needs call.
+        """
+        names = ", ".join(info['repo']['name'] for info in repo_infos)
+        print(f"\n🔧 Analyzing {len(repo_infos)} repositories in one request ({names})...")
+
+        repo_blocks = "\n\n".join(
+            f"[{i}] {self._format_repo_info(info)}" for i, info in enumerate(repo_infos)
+        )
+        user_context = f"""{repo_blocks}
+
+For EACH repository above, identify ONE high-impact, non-disruptive refactoring opportunity.
+Respond with ONLY a JSON array containing one object per repository, each in the output
+format above plus a "repo_index" field holding the repository's [index]."""
+
+        plans = {}
+        skipped = {}
+        try:
+            message = self.client.messages.create(
+                model="claude-sonnet-4-5-20250929",
+                max_tokens=PLAN_MAX_TOKENS * len(repo_infos),
+                system=self._system_prompt,  # <--- HARDWIRED COMPLIANCE BRAIN (prompt-cached)
+                messages=[
+                    {"role": "user", "content": user_context}
+                ]
+            )
 
-Respond with ONLY the JSON, no other text."""
+            response_text = message.content[0].text
+            array_text = response_text[response_text.find('['):response_text.rfind(']') + 1]
+            for entry in _loads(array_text):
+                if not isinstance(entry, dict):
+                    continue
+                if entry.get('skip'):
+                    skipped[entry.get('repo_index')] = entry.get('reason', 'no refactoring needed')
+                    continue
+                try:
+                    plans[entry.get('repo_index')] = RefactorPlan.from_dict(entry)
+                except ValueError:
+                    continue
+        except Exception as e:
+            print(f"   ✗ Batched analysis failed, falling back to per-repository calls: {e}")
 
-    def apply_refactoring(self, refactor_info: Dict) -> Optional[str]:
-        """Apply the refactoring and create a PR."""
-        repo = refactor_info['repo']
-        plan = refactor_info['plan']
+        results = []
+        for i, repo_info in enumerate(repo_infos):
+            if i in skipped:
+                print(f"\n   ⊘ Skipping {repo_info['repo']['name']}: {skipped[i]}")
+                results.append(None)
+                continue
+            plan = plans.get(i)
+            if plan is None:
+                results.append(self.identify_refactoring_needs(repo_info))
+                continue
+            print(f"\n🔧 {repo_info['repo']['name']} (score: {repo_info['quality_score']}/100)")
+            self._report_plan(plan)
+            results.append({'repo': repo_info['repo'], 'plan': plan})
 
-        print(f"\n🔨 Applying refactoring to {repo['name']}...")
+        return results
 
-        # Extract repo name from URL
-        repo_url = repo['url']
-        repo_name = repo_url.split('/')[-1]
+    def _clone_only(self, refactor_info: Dict, workdir: Path) -> Optional[Path]:
+        """Shallow, blobless clone of the repo a refactor targets into workdir; returns the clone dir."""
+        repo_name = refactor_info['repo']['url'].split('/')[-1]
         full_repo_name = f"{self.github_owner}/{repo_name}"
 
         try:
-            # Clone repository
-            clone_dir = self.base_path / 'temp' / repo_name
-            clone_dir.parent.mkdir(parents=True, exist_ok=True)
-
-            if clone_dir.exists():
-                # Clean up existing clone
-                subprocess.run(['rm', '-rf', str(clone_dir)], check=True)
+            clone_dir = workdir / repo_name
 
             subprocess.run([
-                'gh', 'repo', 'clone', full_repo_name, str(clone_dir)
-            ], check=True, env={
-                **os.environ,
-                'GH_TOKEN': self.github_token
-            })
+                'gh', 'repo', 'clone', full_repo_name, str(clone_dir),
+                '--', '--depth=1', '--filter=blob:none'
+            ], check=True, env=self._gh_env)
 
-            print(f"   ✓ Cloned repository")
+            print(f"   ✓ Cloned {full_repo_name}")
+            return clone_dir
+
+        except Exception as e:
+            print(f"   ✗ Error cloning {full_repo_name}: {e}")
+            return None
+
+    def apply_refactoring(self, refactor_info: Dict, clone_dir: Path) -> Optional[str]:
+        """Apply the refactoring in an existing clone and create a PR."""
+        repo = refactor_info['repo']
+        plan = refactor_info['plan']
+
+        print(f"\n🔨 Applying refactoring to {repo['name']}...")
 
+        try:
             # Create refactor branch
             timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
             branch_name = f"refactor/daily-cleanup-{timestamp}"
@@ -232,28 +545,28 @@ Respond with ONLY the JSON, no other text."""
             # Apply refactoring using Claude (simulated for now)
             # In production, this would use Claude Code Action to actually modify files
             print(f"   ℹ️  Refactoring would be applied here via Claude Code Action")
-            print(f"   Plan: {plan['description']}")
+            print(f"   Plan: {plan.description}")
 
             # For simulation, create a marker file
             marker_file = clone_dir / 'REFACTOR_APPLIED.md'
             marker_content = f"""# Refactoring Applied
 
-**Type:** {plan['refactor_type']}
-**Title:** {plan['title']}
+**Type:** {plan.refactor_type}
+**Title:** {plan.title}
 **Date:** {datetime.now().isoformat()}
 
 ## Description
-{plan['description']}
+{plan.description}
 
 ## Rationale
-{plan['rationale']}
+{plan.rationale}
 
 ## Files Affected
-{chr(10).join(f'- {f}' for f in plan['files_affected'])}
+{chr(10).join(f'- {f}' for f in plan.files_affected)}
 
 ## Risk Assessment
-- **Tier:** {plan['estimated_risk']}
-- **Impact:** {plan['impact']}
+- **Tier:** {plan.estimated_risk}
+- **Impact:** {plan.impact}
 
 ---
 *Generated by Autonomous Janitor Engine*
@@ -264,115 +577,142 @@ Respond with ONLY the JSON, no other text."""
             subprocess.run(['git', 'add', '.'], cwd=clone_dir, check=True)
             subprocess.run([
                 'git', 'commit', '-m',
-                f"refactor: {plan['title']}\n\n{plan['description']}\n\nGenerated by Autonomous Janitor Engine\nTier: {plan['estimated_risk']}"
+                f"refactor: {plan.title}\n\n{plan.description}\n\nGenerated by Autonomous Janitor Engine\nTier: {plan.estimated_risk}"
             ], cwd=clone_dir, check=True)
 
             # Push branch
-            subprocess.run(['git', 'push', '-u', 'origin', branch_name], cwd=clone_dir, check=True, env={
-                **os.environ,
-                'GH_TOKEN': self.github_token
-            })
+            subprocess.run(['git', 'push', '-u', 'origin', branch_name], cwd=clone_dir, check=True,
+                           env=self._gh_env)
 
             print(f"   ✓ Pushed refactor branch")
 
             # Create PR
             pr_body = f"""## Refactoring Summary
 
-**Type:** {plan['refactor_type']}
-**Impact:** {plan['impact']}
-**Risk Tier:** {plan['estimated_risk']}
+**Type:** {plan.refactor_type}
+**Impact:** {plan.impact}
+**Risk Tier:** {plan.estimated_risk}
 
 ### Description
-{plan['description']}
+{plan.description}
 
 ### Rationale
-{plan['rationale']}
+{plan.rationale}
 
 ### Files Affected
-{chr(10).join(f'- `{f}`' for f in plan['files_affected'])}
+{chr(10).join(f'- `{f}`' for f in plan.files_affected)}
 
 ### Action Required
 - [ ] Review changes
 - [ ] Verify tests pass
-- [ ] {f"Merge (Tier 0 - Auto-merge eligible)" if plan['estimated_risk'] == 'tier_0' else f"Request review (Tier 1)"}
+- [ ] {f"Merge (Tier 0 - Auto-merge eligible)" if plan.estimated_risk == 'tier_0' else f"Request review (Tier 1)"}
 
 ---
 🤖 Generated by [Autonomous Janitor Engine](https://github.com/abiolaogu/factory-template)
 """
 
-            create_pr_cmd = [
-                'gh', 'pr', 'create',
-                '--title', f"refactor: {plan['title']}",
-                '--body', pr_body,
-                '--base', 'main',
-                '--head', branch_name
-            ]
-
-            result = subprocess.run(create_pr_cmd, cwd=clone_dir, capture_output=True, text=True, env={
-                **os.environ,
-                'GH_TOKEN': self.github_token
-            })
+            # Open the PR with one REST call rather than a cold `gh pr create` process
+            full_repo_name = f"{self.github_owner}/{clone_dir.name}"
+            response = requests.post(
+                f"{GITHUB_API_URL}/repos/{full_repo_name}/pulls",
+                headers={
+                    "Authorization": f"token {self.github_token}",
+                    "Accept": "application/vnd.github+json"
+                },
+                json={
+                    "title": f"refactor: {plan.title}",
+                    "body": pr_body,
+                    "base": "main",
+                    "head": branch_name
+                },
+                timeout=30
+            )
 
-            if result.returncode == 0:
-                pr_url = result.stdout.strip()
+            if response.status_code == 201:
+                pr_url = response.json()['html_url']
                 print(f"   ✓ Created PR: {pr_url}")
-
-                # Clean up clone
-                subprocess.run(['rm', '-rf', str(clone_dir)], check=True)
-
                 return pr_url
             else:
-                print(f"   ✗ Failed to create PR: {result.stderr}")
+                print(f"   ✗ Failed to create PR: {response.status_code} {response.text}")
                 return None
 
         except Exception as e:
             print(f"   ✗ Error applying refactoring: {e}")
             return None
 
-    def run_janitor_loop(self, target_count: int = 2) -> List[Dict]:
-        """Run the janitor engine to refactor existing repositories."""
+    def run_janitor_loop(self, target_count: int = 2, sync: bool = False) -> List[Dict]:
+        """
+        Run the janitor engine to refactor existing repositories.
+
+        With sync=True the analyses use direct Claude calls instead of a message batch.
+        """
         print("\n" + "=" * 60)
         print("🧹 JANITOR ENGINE - STARTING")
         print("=" * 60)
         print(f"Target: {target_count} refactoring PRs")
 
-        # Scan repositories
-        scored_repos = self.scan_repositories()
+        # Scan repositories, keeping those with lowest scores (most in need of
+        # refactoring); 2x targets to ensure we hit our goal
+        target_repos = self.scan_repositories(limit=target_count * 2)
 
-        if not scored_repos:
+        if not target_repos:
             print("\n⚠️  No repositories found to refactor")
             return []
 
-        # Select repositories with lowest scores (most in need of refactoring)
-        target_repos = scored_repos[:target_count * 2]  # Get 2x targets to ensure we hit our goal
+        # Identify refactoring needs: the daily run goes through the cheaper
+        # Message Batches API, ad-hoc runs call Claude directly
+        if sync:
+            refactor_infos = self._identify_refactoring_needs_direct(target_repos)
+        else:
+            refactor_infos = self.identify_refactoring_needs_offline(target_repos)
 
-        # Apply refactoring
-        refactored = []
-        for repo_info in target_repos:
-            if len(refactored) >= target_count:
-                break
+        sys.stdout.flush()
 
-            # Identify refactoring needs
-            refactor_info = self.identify_refactoring_needs(repo_info)
+        # Drop failed analyses and high-risk (Tier 2) plans
+        eligible = []
+        for refactor_info in refactor_infos:
             if not refactor_info:
                 continue
 
-            # Skip if high-risk (Tier 2)
-            if refactor_info['plan']['estimated_risk'] == 'tier_2':
+            if refactor_info['plan'].estimated_risk == 'tier_2':
                 print(f"   ⚠️  Skipping Tier 2 refactoring (too risky for automation)")
                 continue
 
+            eligible.append(refactor_info)
+
+        # Clone every candidate concurrently; clones are network/subprocess bound.
+        # All clones live in one temporary directory that is removed on exit,
+        # whether or not the refactors succeed
+        refactored = []
+        with tempfile.TemporaryDirectory(prefix='janitor_', ignore_cleanup_errors=True) as workdir:
+            print(f"\n📥 Cloning {len(eligible)} repositories...")
+            clone_dirs = []
+            if eligible:
+                with ThreadPoolExecutor(max_workers=min(CLONE_WORKERS, len(eligible))) as executor:
+                    clone_dirs = list(executor.map(
+                        lambda refactor_info: self._clone_only(refactor_info, Path(workdir)),
+                        eligible
+                    ))
+
             # Apply refactoring
-            pr_url = self.apply_refactoring(refactor_info)
-            if pr_url:
-                refactored.append({
-                    'repo': refactor_info['repo']['name'],
-                    'url': pr_url,
-                    'title': refactor_info['plan']['title'],
-                    'type': refactor_info['plan']['refactor_type'],
-                    'tier': refactor_info['plan']['estimated_risk'],
-                    'timestamp': datetime.now().isoformat()
-                })
+            for refactor_info, clone_dir in zip(eligible, clone_dirs):
+                if len(refactored) >= target_count:
+                    break
+
+                if clone_dir is None:
+                    continue
+
+                pr_url = self.apply_refactoring(refactor_info, clone_dir)
+                sys.stdout.flush()
+                if pr_url:
+                    refactored.append({
+                        'repo': refactor_info['repo']['name'],
+                        'url': pr_url,
+                        'title': refactor_info['plan'].title,
+                        'type': refactor_info['plan'].refactor_type,
+                        'tier': refactor_info['plan'].estimated_risk,
+                        'timestamp': datetime.now().isoformat()
+                    })
 
         print("\n" + "=" * 60)
         print(f"✅ JANITOR ENGINE - COMPLETE")
@@ -384,6 +724,11 @@ Respond with ONLY the JSON, no other text."""
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Autonomous Janitor Engine')
+    parser.add_argument('--sync', action='store_true',
+                        help='Call Claude directly instead of via the Message Batches API')
+    args = parser.parse_args()
+
     print("🧹 Autonomous Janitor Engine")
     print("=" * 60)
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -392,17 +737,13 @@ def main():
         engine = AutonomousJanitorEngine()
 
         # Check if manifest has components before proceeding
-        manifest_path = Path(__file__).parent.parent / '.repo-index' / 'manifest.yaml'
-        if manifest_path.exists():
-            with open(manifest_path, 'r') as f:
-                manifest = yaml.safe_load(f) or {}
-
-            if not manifest.get('components'):
-                print("⚠️ Manifest is empty. No repositories to refactor. Skipping Janitor run.")
-                return 0
+        manifest = engine.manifest
+        if manifest is not None and not manifest.get('components'):
+            print("⚠️ Manifest is empty. No repositories to refactor. Skipping Janitor run.")
+            return 0
 
         # Run janitor engine (2 refactorings)
-        refactor_prs = engine.run_janitor_loop(target_count=2)
+        refactor_prs = engine.run_janitor_loop(target_count=2, sync=args.sync)
 
         # Print summary
         print("\n" + "=" * 60)
@@ -437,54 +778,57 @@ def update_dashboard(dashboard_path: Path, refactor_prs: List[Dict]):
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     date_str = datetime.now().strftime('%Y-%m-%d')
 
-    # Read existing content
     if not dashboard_path.exists():
         print(f"   ⚠️  Dashboard doesn't exist yet, will be created by creator engine")
         return
 
-    with open(dashboard_path, 'r') as f:
-        content = f.read()
-
-    # Find today's entry and update refactor section
-    section_header = f"## Growth Report: {date_str}"
-
-    if section_header in content:
-        # Update existing entry
-        # Find the Refactor Actions section
-        refactor_section = "### Refactor Actions (Janitor Engine)\n\n"
-        refactor_start = content.find(refactor_section)
-
-        if refactor_start != -1:
-            # Find end of refactor section (next ### or ---)
-            refactor_content_start = refactor_start + len(refactor_section)
-            next_section = content.find("###", refactor_content_start)
-
-            if next_section == -1:
-                next_section = content.find("---", refactor_content_start)
-
-            # Generate new refactor content
-            new_refactor_content = ""
-            if refactor_prs:
-                for i, pr in enumerate(refactor_prs, 1):
-                    new_refactor_content += f"{i}. **{pr['title']}**\n"
-                    new_refactor_content += f"   - PR: [{pr['url']}]({pr['url']})\n"
-                    new_refactor_content += f"   - Repository: {pr['repo']}\n"
-                    new_refactor_content += f"   - Type: {pr['type']}\n\n"
-            else:
-                new_refactor_content = "*No refactoring actions today*\n\n"
+    # Generate new refactor content
+    new_refactor_content = ""
+    if refactor_prs:
+        for i, pr in enumerate(refactor_prs, 1):
+            new_refactor_content += f"{i}. **{pr['title']}**\n"
+            new_refactor_content += f"   - PR: [{pr['url']}]({pr['url']})\n"
+            new_refactor_content += f"   - Repository: {pr['repo']}\n"
+            new_refactor_content += f"   - Type: {pr['type']}\n\n"
+    else:
+        new_refactor_content = "*No refactoring actions today*\n\n"
+
+    # Stream the dashboard line by line into a temp file, swapping in the new
+    # refactor content under today's header, then atomically replace the original
+    section_header = f"{_REPORT_PREFIX}{date_str}\n"
+    tmp_path = dashboard_path.with_suffix('.md.tmp')
+    in_today = False
+    found_today = False
+    replaced = False
+    skipping = False
+
+    with open(dashboard_path, 'r') as src, open(tmp_path, 'w') as dst:
+        for line in src:
+            if skipping:
+                if not line.startswith(('###', '---', '## ')):
+                    continue
+                skipping = False
+
+            if line.startswith(_REPORT_PREFIX):
+                # Only the first of several same-day entries gets the new content
+                in_today = line == section_header and not replaced
+                found_today = found_today or in_today
+            elif in_today and line == _REFACTOR_HEADER:
+                dst.write(line + "\n" + new_refactor_content)
+                replaced = True
+                skipping = True
+                continue
 
-            # Replace content
-            if next_section != -1:
-                content = content[:refactor_content_start] + new_refactor_content + content[next_section:]
-            else:
-                content = content[:refactor_content_start] + new_refactor_content
+            dst.write(line)
 
-            with open(dashboard_path, 'w') as f:
-                f.write(content)
+    if replaced:
+        os.replace(tmp_path, dashboard_path)
+        print(f"   ✓ Dashboard updated")
+        return
 
-            print(f"   ✓ Dashboard updated")
-        else:
-            print(f"   ⚠️  Refactor section not found in today's entry")
+    tmp_path.unlink()
+    if found_today:
+        print(f"   ⚠️  Refactor section not found in today's entry")
     else:
         print(f"   ⚠️  No entry for today found, will be created by creator engine")
 
@@ -20,8 +20,17 @@ import sys
 import shutil
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl from linux/fs.h: share the source file's extents copy-on-write
+FICLONE = 0x40049409
 
 
 class Colors:
@@ -34,6 +43,24 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+def _reflink_or_copy(source: str, target: str):
+    """
+    Clone source's data into target copy-on-write, copying the bytes instead
+    where the filesystem can't share extents.
+
+    Unlike a hardlink, the target is an independent inode, so later writes in
+    the clone never reach the factory's own files.
+    """
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except (AttributeError, OSError):
+        # No fcntl (Windows) or no reflink support (ext4, tmpfs, macOS)
+        shutil.copy2(source, target)
+        return
+    shutil.copystat(source, target)
+
+
 class FactoryInstaller:
     """Handles installation of Factory Template into remote repositories"""
 
@@ -46,10 +73,15 @@ class FactoryInstaller:
         'requirements.txt',
     ]
 
+    # Commit identity, applied with `git -c` on the commit itself
+    GIT_IDENTITY = [
+        '-c', 'user.email=factory@billyrinksglobal.com',
+        '-c', 'user.name=Factory Installer',
+    ]
+
     def __init__(self, target_repo_url: str):
         self.target_repo_url = target_repo_url.rstrip('/')
         self.factory_root = Path(__file__).parent.parent.absolute()
-        self.temp_dir = None
         self.target_dir = None
 
         # Validate environment
@@ -60,13 +92,15 @@ class FactoryInstaller:
                 "Please set your GitHub Personal Access Token with 'repo' and 'workflow' scopes."
             )
 
-    def _run_command(self, cmd: List[str], cwd: Path = None, check: bool = True) -> Tuple[int, str, str]:
+    def _run_command(self, cmd: List[str], cwd: Path = None, check: bool = True,
+                     env: Dict[str, str] = None) -> Tuple[int, str, str]:
         """Run a shell command and return exit code, stdout, stderr"""
         result = subprocess.run(
             cmd,
             cwd=cwd or self.factory_root,
             capture_output=True,
             text=True,
+            env=env,
             check=False
         )
 
@@ -104,17 +138,13 @@ class FactoryInstaller:
         """Clone the target repository to a temporary directory"""
         print(f"{Colors.YELLOW}➤{Colors.NC} Cloning target repository...")
 
-        # Create temporary directory
-        self.temp_dir = tempfile.mkdtemp(prefix='factory_install_')
-        self.target_dir = Path(self.temp_dir) / 'target_repo'
-
         # Create authenticated URL
         auth_url = self._create_authenticated_url(self.target_repo_url)
 
-        # Clone the repository
+        # Clone the repository (tip only; the upgrade commit doesn't need history)
         try:
             self._run_command([
-                'git', 'clone',
+                'git', 'clone', '--depth=1',
                 auth_url,
                 str(self.target_dir)
             ])
@@ -123,75 +153,87 @@ class FactoryInstaller:
             print(f"{Colors.RED}  ✗{Colors.NC} Failed to clone repository")
             raise
 
-    def inject_factory_components(self):
-        """Copy factory components to target repository"""
-        print(f"{Colors.YELLOW}➤{Colors.NC} Injecting factory components...")
+    def _install_one_component(self, component: str, copy_function) -> List[str]:
+        """Install a single factory component; returns its log lines for the caller to print"""
+        source = self.factory_root / component
+        target = self.target_dir / component
+        log = []
 
-        for component in self.FACTORY_COMPONENTS:
-            source = self.factory_root / component
-            target = self.target_dir / component
+        if not source.exists():
+            log.append(f"{Colors.YELLOW}  ⚠{Colors.NC} Skipping {component} (not found in factory)")
+            return log
 
-            if not source.exists():
-                print(f"{Colors.YELLOW}  ⚠{Colors.NC} Skipping {component} (not found in factory)")
-                continue
+        # Handle directories
+        if source.is_dir():
+            # Remove target directory if it exists (factory is source of truth)
+            if target.exists():
+                log.append(f"{Colors.CYAN}    Replacing existing {component}{Colors.NC}")
+                shutil.rmtree(target)
 
-            # Handle directories
-            if source.is_dir():
-                # Remove target directory if it exists (factory is source of truth)
-                if target.exists():
-                    print(f"{Colors.CYAN}    Replacing existing {component}{Colors.NC}")
-                    shutil.rmtree(target)
+            # Copy directory tree
+            shutil.copytree(source, target, copy_function=copy_function)
+            log.append(f"{Colors.GREEN}  ✓{Colors.NC} Installed {component}/")
 
-                # Copy directory tree
-                shutil.copytree(source, target)
-                print(f"{Colors.GREEN}  ✓{Colors.NC} Installed {component}/")
+        # Handle files
+        else:
+            # Create parent directories if needed
+            target.parent.mkdir(parents=True, exist_ok=True)
 
-            # Handle files
-            else:
-                # Create parent directories if needed
-                target.parent.mkdir(parents=True, exist_ok=True)
+            # Copy file (overwrite if exists)
+            if target.exists():
+                log.append(f"{Colors.CYAN}    Replacing existing {component}{Colors.NC}")
+                target.unlink()
 
-                # Copy file (overwrite if exists)
-                if target.exists():
-                    print(f"{Colors.CYAN}    Replacing existing {component}{Colors.NC}")
+            copy_function(source, target)
+            log.append(f"{Colors.GREEN}  ✓{Colors.NC} Installed {component}")
 
-                shutil.copy2(source, target)
-                print(f"{Colors.GREEN}  ✓{Colors.NC} Installed {component}")
+        return log
 
-        print()
+    def inject_factory_components(self):
+        """Copy factory components to target repository"""
+        print(f"{Colors.YELLOW}➤{Colors.NC} Injecting factory components...")
+
+        # Reflink instead of copying bytes when the clone shares the factory's filesystem
+        if self.factory_root.stat().st_dev == self.target_dir.stat().st_dev:
+            copy_function = _reflink_or_copy
+        else:
+            copy_function = shutil.copy2
+
+        # Components are independent trees, so copy them concurrently and print
+        # each one's log afterwards, in component order
+        with ThreadPoolExecutor(max_workers=len(self.FACTORY_COMPONENTS)) as executor:
+            logs = executor.map(
+                lambda component: self._install_one_component(component, copy_function),
+                self.FACTORY_COMPONENTS
+            )
+            print("\n".join(line for log in logs for line in log) + "\n")
+        sys.stdout.flush()
 
     def commit_and_push(self):
         """Commit changes and push to remote"""
         print(f"{Colors.YELLOW}➤{Colors.NC} Committing factory upgrade...")
 
-        # Configure git user (required for commit)
-        self._run_command([
-            'git', 'config', 'user.email', 'factory@billyrinksglobal.com'
-        ], cwd=self.target_dir)
-
-        self._run_command([
-            'git', 'config', 'user.name', 'Factory Installer'
-        ], cwd=self.target_dir)
-
         # Stage all factory components
         self._run_command(['git', 'add', '-A'], cwd=self.target_dir)
 
-        # Check if there are changes to commit
-        returncode, stdout, _ = self._run_command(
-            ['git', 'status', '--porcelain'],
-            cwd=self.target_dir,
-            check=False
-        )
-
-        if not stdout.strip():
-            print(f"{Colors.YELLOW}  ⚠{Colors.NC} No changes detected - factory may already be installed")
-            return
-
-        # Commit changes
+        # Commit changes; git itself reports an empty index, so no separate status scan.
+        # LC_ALL=C keeps that report in English whatever the caller's locale
         commit_message = "feat: upgrade system to Autonomous Factory Standard"
-        self._run_command([
-            'git', 'commit', '-m', commit_message
-        ], cwd=self.target_dir)
+        # Git user is passed per command (required for commit) instead of two
+        # separate `git config` processes
+        returncode, stdout, stderr = self._run_command([
+            'git', *self.GIT_IDENTITY, 'commit', '-m', commit_message
+        ], cwd=self.target_dir, check=False, env={**os.environ, 'LC_ALL': 'C'})
+
+        if returncode != 0:
+            if 'nothing to commit' in stdout:
+                print(f"{Colors.YELLOW}  ⚠{Colors.NC} No changes detected - factory may already be installed")
+                return
+            raise RuntimeError(
+                f"{Colors.RED}Command failed: git commit{Colors.NC}\n"
+                f"Exit code: {returncode}\n"
+                f"Error: {stderr}"
+            )
 
         print(f"{Colors.GREEN}  ✓{Colors.NC} Changes committed\n")
 
@@ -229,12 +271,6 @@ class FactoryInstaller:
             print(f"{Colors.RED}  ✗{Colors.NC} Validation failed\n")
             raise RuntimeError("Installation validation failed")
 
-    def cleanup(self):
-        """Clean up temporary directory"""
-        if self.temp_dir and Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
-            print(f"{Colors.CYAN}  ℹ{Colors.NC} Cleaned up temporary files\n")
-
     def print_summary(self):
         """Print installation summary"""
         print(f"{Colors.BLUE}{'=' * 60}{Colors.NC}")
@@ -263,17 +299,20 @@ class FactoryInstaller:
     def install(self):
         """Execute the complete installation process"""
         try:
-            self.print_banner()
-            self.clone_target_repo()
-            self.inject_factory_components()
-            self.commit_and_push()
-            self.validate_installation()
-            self.print_summary()
+            # The clone lives only as long as this block; the directory is removed
+            # on exit even if a step raises
+            with tempfile.TemporaryDirectory(prefix='factory_install_') as temp_dir:
+                self.target_dir = Path(temp_dir) / 'target_repo'
+                self.print_banner()
+                self.clone_target_repo()
+                self.inject_factory_components()
+                self.commit_and_push()
+                self.validate_installation()
+                self.print_summary()
+            print(f"{Colors.CYAN}  ℹ{Colors.NC} Cleaned up temporary files\n")
         except Exception as e:
             print(f"\n{Colors.RED}Installation failed: {e}{Colors.NC}\n")
             raise
-        finally:
-            self.cleanup()
 
 
 def main():
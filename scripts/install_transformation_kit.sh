@@ -52,9 +52,11 @@ mkdir -p "$TARGET_REPO/templates/config"
 # Copy universal scripts
 echo -e "${YELLOW}➤${NC} Installing universal scripts..."
 cp "$FACTORY_ROOT/scripts/universal/detect_tech_stack.py" "$TARGET_REPO/scripts/universal/"
+cp "$FACTORY_ROOT/scripts/universal/universal_common.py" "$TARGET_REPO/scripts/universal/"
 cp "$FACTORY_ROOT/scripts/universal/universal_test.py" "$TARGET_REPO/scripts/universal/"
 cp "$FACTORY_ROOT/scripts/universal/universal_build.py" "$TARGET_REPO/scripts/universal/"
 cp "$FACTORY_ROOT/scripts/universal/universal_lint.py" "$TARGET_REPO/scripts/universal/"
+cp "$FACTORY_ROOT/scripts/universal/universal_run.py" "$TARGET_REPO/scripts/universal/"
 cp "$FACTORY_ROOT/scripts/universal/README.md" "$TARGET_REPO/scripts/universal/"
 
 # Make scripts executable
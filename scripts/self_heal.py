@@ -5,10 +5,38 @@ Analyzes CI/CD failures and attempts safe, automated fixes for Tier 0/1 issues.
 """
 
 import os
+import re
 import sys
 import json
+import subprocess
+import importlib.util
 from pathlib import Path
 
+# Tier 2: High-risk infrastructure (NEVER auto-fix)
+TIER2_KEYWORDS = [
+    'deploy', 'production', 'infrastructure',
+    'auth', 'payment', 'security', 'migration',
+    'terraform', 'helm', 'k8s'
+]
+
+# Tier 0: Low-risk documentation/testing (Safe to auto-fix)
+TIER0_KEYWORDS = [
+    'test', 'lint', 'doc', 'research', 'alignment',
+    'audit', 'scan', 'analysis'
+]
+
+# Each tier's keywords compiled once into a single alternation, so a workflow
+# name is scanned once per tier instead of once per keyword
+_TIER2_PATTERN = re.compile('|'.join(map(re.escape, TIER2_KEYWORDS)))
+_TIER0_PATTERN = re.compile('|'.join(map(re.escape, TIER0_KEYWORDS)))
+
+# Changed files with these suffixes suggest a formatting/lint failure
+FORMATTABLE_SUFFIXES = frozenset({'.py', '.js', '.ts', '.md'})
+
+# Dependency manifests checked in the repository root
+DEPENDENCY_MANIFESTS = frozenset({'package.json', 'requirements.txt'})
+
+
 def classify_failure_tier(workflow_name: str, failed_jobs: list) -> int:
     """
     Classify the failure tier based on workflow name and job content.
@@ -22,26 +50,44 @@ def classify_failure_tier(workflow_name: str, failed_jobs: list) -> int:
     workflow_lower = workflow_name.lower()
 
     # Tier 2: High-risk infrastructure (NEVER auto-fix)
-    tier2_keywords = [
-        'deploy', 'production', 'infrastructure',
-        'auth', 'payment', 'security', 'migration',
-        'terraform', 'helm', 'k8s'
-    ]
-    if any(keyword in workflow_lower for keyword in tier2_keywords):
+    if _TIER2_PATTERN.search(workflow_lower):
         return 2
 
     # Tier 0: Low-risk documentation/testing (Safe to auto-fix)
-    tier0_keywords = [
-        'test', 'lint', 'doc', 'research', 'alignment',
-        'audit', 'scan', 'analysis'
-    ]
-    if any(keyword in workflow_lower for keyword in tier0_keywords):
+    if _TIER0_PATTERN.search(workflow_lower):
         return 0
 
     # Tier 1: Feature development (Consider auto-fix)
     return 1
 
 
+def changed_paths() -> list:
+    """
+    Paths reported by `git status`, without a shell.
+
+    Uses NUL-terminated porcelain output so paths containing spaces or newlines
+    come through intact. Rename/copy entries also carry the original path as the
+    following field, which is skipped.
+    """
+    result = subprocess.run(
+        ['git', 'status', '--porcelain', '-z'],
+        capture_output=True,
+        stdin=subprocess.DEVNULL
+    )
+    if result.returncode != 0:
+        return []
+
+    paths = []
+    fields = iter(result.stdout.split(b'\0'))
+    for entry in fields:
+        if len(entry) < 4:
+            continue
+        paths.append(os.fsdecode(entry[3:]))
+        if entry[:1] in (b'R', b'C') or entry[1:2] in (b'R', b'C'):
+            next(fields, None)
+    return paths
+
+
 def analyze_common_failures() -> dict:
     """
     Analyze common failure patterns and return suggested fixes.
@@ -52,10 +98,10 @@ def analyze_common_failures() -> dict:
     - 'description': str
     """
     # Check for common patterns in git status
-    git_status = os.popen('git status --porcelain').read()
+    changed_suffixes = {os.path.splitext(path)[1] for path in changed_paths()}
 
     # Pattern 1: Formatting/linting issues
-    if any(file.endswith(('.py', '.js', '.ts', '.md')) for file in git_status.split('\n')):
+    if not FORMATTABLE_SUFFIXES.isdisjoint(changed_suffixes):
         return {
             'fixable': True,
             'fix_type': 'formatting',
@@ -63,7 +109,7 @@ def analyze_common_failures() -> dict:
         }
 
     # Pattern 2: Missing dependencies
-    if Path('package.json').exists() or Path('requirements.txt').exists():
+    if not DEPENDENCY_MANIFESTS.isdisjoint(os.listdir('.')):
         return {
             'fixable': False,
             'fix_type': 'dependencies',
@@ -78,6 +124,35 @@ def analyze_common_failures() -> dict:
     }
 
 
+def run_black() -> int:
+    """
+    Format the current directory with black, in-process.
+
+    black is installed with pip only if it can't already be imported.
+    Returns black's exit code (non-zero if it couldn't run).
+    """
+    if importlib.util.find_spec('black') is None:
+        install = subprocess.run(
+            [sys.executable, '-m', 'pip', 'install', '--quiet', 'black'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        if install.returncode != 0:
+            return install.returncode
+        importlib.invalidate_caches()
+
+    try:
+        from black import main as black_main
+        result = black_main(['--quiet', '.'], standalone_mode=False)
+    except SystemExit as e:
+        result = e.code
+    except Exception:
+        return 1
+
+    return result or 0
+
+
 def attempt_safe_fix() -> bool:
     """
     Attempt safe automated fixes for common issues.
@@ -95,15 +170,18 @@ def attempt_safe_fix() -> bool:
 
         # Try Python formatting with black
         if Path('requirements.txt').exists():
-            os.system('pip install black 2>/dev/null')
-            result = os.system('black . --quiet 2>/dev/null')
-            if result == 0:
+            if run_black() == 0:
                 print("✅ Applied Python formatting with black")
                 return True
 
         # Try JavaScript/TypeScript formatting with prettier
         if Path('package.json').exists():
-            result = os.system('npx prettier --write . 2>/dev/null')
+            result = subprocess.run(
+                ['npx', 'prettier', '--write', '.'],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            ).returncode
             if result == 0:
                 print("✅ Applied JS/TS formatting with prettier")
                 return True
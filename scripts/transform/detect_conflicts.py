@@ -4,7 +4,7 @@ Conflict Detection Engine (Production Ready)
 compares source and target directories to identify drift.
 
 Features:
-- Binary-safe comparison (filecmp)
+- Binary-safe comparison (parallel, size-first, streamed for large files)
 - JSON reporting for CI/CD pipelines
 - Human-readable CLI output
 - Exit codes for pipeline control
@@ -14,8 +14,9 @@ import os
 import sys
 import json
 import argparse
-import filecmp
+import functools
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set, Union
 from datetime import datetime
@@ -26,11 +27,88 @@ DEFAULT_IGNORE = [
     'venv', '.env', 'dist', 'build', '.idea', '.vscode'
 ]
 
+# Comparison is I/O-bound, so threads overlap well
+COMPARE_WORKERS = (os.cpu_count() or 1) * 4
+
+# Large comparisons fan out to worker processes (one per core) in chunks;
+# below the threshold, process start-up costs more than it saves
+PROCESS_POOL_THRESHOLD = 500
+PROCESS_CHUNK_SIZE = 64
+
+# Files up to this size are read whole and compared; larger ones are streamed
+# block by block into reused buffers, stopping at the first difference
+STREAM_THRESHOLD = 1024 * 1024
+COMPARE_BLOCK_SIZE = 64 * 1024
+
+# Reports are serialized with orjson when it's installed, stdlib json otherwise
+try:
+    import orjson
+
+    def _dump_report(report: Dict) -> bytes:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dump_report(report: Dict) -> bytes:
+        return (json.dumps(report, indent=2) + "\n").encode()
+
+
+def _read_whole(path: Path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _stream_equal(src_file: Path, tgt_file: Path) -> bool:
+    """Compare two equal-sized files block by block without holding either whole."""
+    src_buf = bytearray(COMPARE_BLOCK_SIZE)
+    tgt_buf = bytearray(COMPARE_BLOCK_SIZE)
+    with open(src_file, 'rb', buffering=0) as src, open(tgt_file, 'rb', buffering=0) as tgt:
+        while True:
+            src_len = src.readinto(src_buf)
+            tgt_len = tgt.readinto(tgt_buf)
+            if src_len != tgt_len:
+                return False
+            if not src_len:
+                return True
+            if src_len == COMPARE_BLOCK_SIZE:
+                if src_buf != tgt_buf:
+                    return False
+            elif src_buf[:src_len] != tgt_buf[:tgt_len]:
+                return False
+
+
+def _same_content(paths) -> bool:
+    """
+    True if both files of a (source, target) pair have identical contents.
+
+    Both files are local, so they're compared directly rather than hashed:
+    bytes equality is a memcmp, and large files are streamed so only one block
+    of each is in memory at a time.
+    """
+    src_file, tgt_file = paths
+    src_size = os.stat(src_file).st_size
+    tgt_size = os.stat(tgt_file).st_size
+
+    # Sizes alone settle most drift without opening either file
+    if src_size != tgt_size:
+        return False
+    if src_size == 0:
+        return True
+
+    if src_size <= STREAM_THRESHOLD:
+        return _read_whole(src_file) == _read_whole(tgt_file)
+
+    return _stream_equal(src_file, tgt_file)
+
+
+def _compare_one(src_root: Path, tgt_root: Path, file_rel: str) -> bool:
+    """Picklable per-file comparison for process pools."""
+    return _same_content((src_root / file_rel, tgt_root / file_rel))
+
+
 class ConflictDetector:
     def __init__(self, source: Path, target: Path, ignore_patterns: List[str] = None):
         self.source = source.resolve()
         self.target = target.resolve()
-        self.ignore_patterns = set(ignore_patterns or DEFAULT_IGNORE)
+        self.ignore_patterns = frozenset(ignore_patterns or DEFAULT_IGNORE)
         self.report = {
             "timestamp": datetime.now().isoformat(),
             "status": "clean",
@@ -50,25 +128,40 @@ class ConflictDetector:
 
     def _should_ignore(self, path: Path) -> bool:
         """Check if a file or directory should be ignored."""
-        for part in path.parts:
-            if part in self.ignore_patterns:
-                return True
-        return False
+        return not self.ignore_patterns.isdisjoint(path.parts)
 
     def _get_all_files(self, root_dir: Path) -> Set[str]:
-        """Recursively get all relative file paths."""
+        """
+        Recursively get all relative file paths.
+
+        Walks with os.scandir and builds relative paths as strings; like
+        os.walk, unreadable directories are skipped and symlinked
+        directories are not followed.
+        """
         files = set()
-        for root, dirs, filenames in os.walk(root_dir):
-            # Modify dirs in-place to skip ignored directories during walk
-            dirs[:] = [d for d in dirs if d not in self.ignore_patterns]
-            
-            for filename in filenames:
-                if filename in self.ignore_patterns:
-                    continue
-                    
-                full_path = Path(root) / filename
-                rel_path = full_path.relative_to(root_dir)
-                files.add(str(rel_path))
+        stack = [("", root_dir)]
+        while stack:
+            rel_dir, directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+
+            with entries:
+                for entry in entries:
+                    if entry.name in self.ignore_patterns:
+                        continue
+
+                    rel_path = f"{rel_dir}{os.sep}{entry.name}" if rel_dir else entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if not is_dir:
+                        files.add(rel_path)
+                    elif not entry.is_symlink():
+                        stack.append((rel_path, entry.path))
         return files
 
     def run(self):
@@ -79,33 +172,42 @@ class ConflictDetector:
 
         source_files = self._get_all_files(self.source)
         target_files = self._get_all_files(self.target)
-        all_files = source_files.union(target_files)
 
-        self.report["summary"]["total_analyzed"] = len(all_files)
+        # 1. New File (In Source, not Target)
+        new = sorted(source_files - target_files)
+        self.report["files"]["new"] = new
+        self.report["summary"]["new"] = len(new)
 
-        for file_rel in sorted(all_files):
-            src_file = self.source / file_rel
-            tgt_file = self.target / file_rel
+        # 2. Deleted File (In Target, not Source)
+        deleted = sorted(target_files - source_files)
+        self.report["files"]["deleted"] = deleted
+        self.report["summary"]["deleted"] = len(deleted)
 
-            # 1. New File (In Source, not Target)
-            if file_rel in source_files and file_rel not in target_files:
-                self.report["files"]["new"].append(file_rel)
-                self.report["summary"]["new"] += 1
-                continue
+        # Every file in either tree: the source files plus the deleted ones
+        self.report["summary"]["total_analyzed"] = len(source_files) + len(deleted)
 
-            # 2. Deleted File (In Target, not Source)
-            if file_rel not in source_files and file_rel in target_files:
-                self.report["files"]["deleted"].append(file_rel)
-                self.report["summary"]["deleted"] += 1
-                continue
+        # 3. Compare Content (Both exist): pairs are compared in parallel, on
+        # processes for large trees and threads otherwise
+        common = sorted(source_files & target_files)
+        if len(common) >= PROCESS_POOL_THRESHOLD:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+            map_kwargs = {"chunksize": PROCESS_CHUNK_SIZE}
+        else:
+            executor = ThreadPoolExecutor(max_workers=COMPARE_WORKERS)
+            map_kwargs = {}
+
+        with executor:
+            identical = executor.map(
+                functools.partial(_compare_one, self.source, self.target),
+                common,
+                **map_kwargs
+            )
+
+            modified = [file_rel for file_rel, same in zip(common, identical) if not same]
 
-            # 3. Compare Content (Both exist)
-            # shallow=False forces reading file contents, not just stat signature
-            if filecmp.cmp(src_file, tgt_file, shallow=False):
-                self.report["summary"]["unchanged"] += 1
-            else:
-                self.report["files"]["modified"].append(file_rel)
-                self.report["summary"]["modified"] += 1
+        self.report["files"]["modified"] = modified
+        self.report["summary"]["modified"] = len(modified)
+        self.report["summary"]["unchanged"] = len(common) - len(modified)
 
         # Determine Final Status
         if (self.report["summary"]["new"] > 0 or 
@@ -140,8 +242,7 @@ class ConflictDetector:
 
     def save_json(self, output_path: str):
         """Save report to JSON file."""
-        with open(output_path, 'w') as f:
-            json.dump(self.report, f, indent=2)
+        Path(output_path).write_bytes(_dump_report(self.report))
 
 def main():
     parser = argparse.ArgumentParser(description="Autonomous Factory Conflict Detector")
@@ -13,12 +13,129 @@ Configuration: None required - fully dynamic detection
 """
 
 import os
+import re
 import sys
 import json
+import hashlib
 import argparse
+import functools
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# Manifests read once and shared by the detectors; their contents key the cache
+SHARED_MANIFESTS = ('package.json', 'requirements.txt')
+
+# Detection results cached per input fingerprint; bump CACHE_VERSION when
+# detection logic changes
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'vendorplatform' / 'tech_stack'
+CACHE_VERSION = '3'
+
+# requirements.txt is scanned once for all candidates; the first match in
+# priority order wins, regardless of where it appears in the file
+PY_FRAMEWORKS = ('django', 'flask', 'fastapi', 'pyramid')
+PY_LINTERS = ('pylint', 'flake8', 'black', 'ruff')
+_PY_FW_RE = re.compile(r'\b(' + '|'.join(PY_FRAMEWORKS) + r')\b', re.IGNORECASE)
+_PY_LINTER_RE = re.compile(r'\b(' + '|'.join(PY_LINTERS) + r')\b', re.IGNORECASE)
+_PYTEST_RE = re.compile(r'\bpytest\b', re.IGNORECASE)
+
+# package.json is parsed with orjson when it's installed, stdlib json otherwise
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=None)
+def _root_files(repo_path: Path) -> frozenset:
+    """
+    Names of all entries in the repository root, read with one directory scan.
+
+    Detectors test membership here instead of stat-ing each candidate file.
+    """
+    try:
+        with os.scandir(repo_path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def _read_bytes_safe(path: Path) -> Optional[bytes]:
+    """Raw contents of path, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _parse_json_object(raw: Optional[bytes]) -> Optional[dict]:
+    """Parsed JSON object, or None if raw is missing, invalid, or not an object."""
+    if raw is None:
+        return None
+    try:
+        data = _json_loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _decode_text(raw: Optional[bytes]) -> Optional[str]:
+    """UTF-8 text of raw, or None if it's missing or not valid UTF-8."""
+    if raw is None:
+        return None
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+
+def _cache_path(root_files: frozenset, manifests: Dict[str, bytes]) -> Path:
+    """
+    Cache file for a detection result.
+
+    Detection depends only on the root entry names and the shared manifests'
+    contents, so those (plus CACHE_VERSION) form the key.
+    """
+    hasher = hashlib.sha256(CACHE_VERSION.encode())
+    for name in sorted(root_files):
+        hasher.update(name.encode() + b'\0')
+    for name in sorted(manifests):
+        hasher.update(name.encode() + b'\0' + manifests[name] + b'\0')
+    return CACHE_DIR / f"{hasher.hexdigest()}.json"
+
+
+def _write_cache(cache_path: Path, result: Dict):
+    """Store a detection result atomically; caching is best-effort."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _package_section(package_data: dict, *keys: str) -> dict:
+    """
+    Merged package.json sections (e.g. dependencies + devDependencies).
+
+    Sections that aren't JSON objects are ignored, so a malformed manifest
+    reads as having no entries rather than raising.
+    """
+    merged = {}
+    for key in keys:
+        section = package_data.get(key)
+        if isinstance(section, dict):
+            merged.update(section)
+    return merged
+
+
+def _first_match(pattern: re.Pattern, text: str, priority: tuple) -> Optional[str]:
+    """Highest-priority name matched by pattern anywhere in text, in one scan."""
+    found = {match.lower() for match in pattern.findall(text)}
+    return next((name for name in priority if name in found), None)
+
 
 def detect_package_manager(repo_path: Path) -> Optional[str]:
     """
@@ -44,9 +161,10 @@ def detect_package_manager(repo_path: Path) -> Optional[str]:
         'gradle': ['build.gradle', 'build.gradle.kts'],
     }
 
+    root_files = _root_files(repo_path)
     for manager, files in indicators.items():
         for file in files:
-            if (repo_path / file).exists():
+            if file in root_files:
                 return manager
 
     return None
@@ -78,10 +196,12 @@ def detect_language(repo_path: Path) -> Dict[str, any]:
         ('*.fsproj', 'fsharp', None),
     ]
 
+    root_files = _root_files(repo_path)
     for pattern, language, framework_hint in language_indicators:
         if '*' in pattern:
-            # Glob pattern
-            if list(repo_path.glob(pattern)):
+            # Suffix pattern ('*.csproj'), matched against the root scan
+            suffix = pattern[1:]
+            if any(name.endswith(suffix) for name in root_files):
                 return {
                     'language': language,
                     'framework': framework_hint,
@@ -89,7 +209,7 @@ def detect_language(repo_path: Path) -> Dict[str, any]:
                 }
         else:
             # Exact file
-            if (repo_path / pattern).exists():
+            if pattern in root_files:
                 return {
                     'language': language,
                     'framework': framework_hint,
@@ -103,13 +223,16 @@ def detect_language(repo_path: Path) -> Dict[str, any]:
     }
 
 
-def detect_framework(repo_path: Path, language: str) -> Optional[str]:
+def detect_framework(repo_path: Path, language: str, package_data: Optional[dict] = None,
+                     requirements_text: Optional[str] = None) -> Optional[str]:
     """
     Detect specific framework based on language and project files.
 
     Args:
         repo_path: Path to repository root
         language: Detected programming language
+        package_data: Parsed package.json, or None if absent/invalid
+        requirements_text: Contents of requirements.txt, or None if absent
 
     Returns:
         Framework name or None
@@ -124,12 +247,6 @@ def detect_framework(repo_path: Path, language: str) -> Optional[str]:
             'nuxt': ['nuxt'],
             'svelte': ['svelte'],
         },
-        'python': {
-            'django': ['django'],
-            'flask': ['flask'],
-            'fastapi': ['fastapi'],
-            'pyramid': ['pyramid'],
-        },
         'dart': {
             'flutter': ['flutter'],
         },
@@ -139,41 +256,28 @@ def detect_framework(repo_path: Path, language: str) -> Optional[str]:
     }
 
     # Check package.json dependencies
-    package_json = repo_path / 'package.json'
-    if package_json.exists() and language == 'javascript':
-        try:
-            with open(package_json) as f:
-                data = json.load(f)
-                dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
+    if package_data is not None and language == 'javascript':
+        dependencies = _package_section(package_data, 'dependencies', 'devDependencies')
 
-                for framework, indicators in framework_indicators.get('javascript', {}).items():
-                    if any(indicator in dependencies for indicator in indicators):
-                        return framework
-        except:
-            pass
+        for framework, indicators in framework_indicators.get('javascript', {}).items():
+            if any(indicator in dependencies for indicator in indicators):
+                return framework
 
     # Check requirements.txt
-    requirements = repo_path / 'requirements.txt'
-    if requirements.exists() and language == 'python':
-        try:
-            with open(requirements) as f:
-                content = f.read().lower()
-
-                for framework, indicators in framework_indicators.get('python', {}).items():
-                    if any(indicator in content for indicator in indicators):
-                        return framework
-        except:
-            pass
+    if requirements_text is not None and language == 'python':
+        framework = _first_match(_PY_FW_RE, requirements_text, PY_FRAMEWORKS)
+        if framework:
+            return framework
 
     # Check pubspec.yaml
-    pubspec = repo_path / 'pubspec.yaml'
-    if pubspec.exists() and language == 'dart':
+    if 'pubspec.yaml' in _root_files(repo_path) and language == 'dart':
         return 'flutter'
 
     return None
 
 
-def detect_build_system(repo_path: Path, language: str, package_manager: Optional[str]) -> Dict[str, any]:
+def detect_build_system(repo_path: Path, language: str, package_manager: Optional[str],
+                        package_data: Optional[dict] = None) -> Dict[str, any]:
     """
     Detect build system and common build commands.
 
@@ -181,6 +285,7 @@ def detect_build_system(repo_path: Path, language: str, package_manager: Optiona
         repo_path: Path to repository root
         language: Detected programming language
         package_manager: Detected package manager
+        package_data: Parsed package.json, or None if absent/invalid
 
     Returns:
         Dictionary with build system information
@@ -192,19 +297,13 @@ def detect_build_system(repo_path: Path, language: str, package_manager: Optiona
     }
 
     # Check for common build scripts in package.json
-    package_json = repo_path / 'package.json'
-    if package_json.exists():
-        try:
-            with open(package_json) as f:
-                data = json.load(f)
-                scripts = data.get('scripts', {})
+    if package_data is not None:
+        scripts = _package_section(package_data, 'scripts')
 
-                if 'build' in scripts:
-                    build_info['enabled'] = True
-                    build_info['command'] = f'{package_manager} run build' if package_manager else 'npm run build'
-                    build_info['output_dir'] = 'dist'  # Common default
-        except:
-            pass
+        if 'build' in scripts:
+            build_info['enabled'] = True
+            build_info['command'] = f'{package_manager} run build' if package_manager else 'npm run build'
+            build_info['output_dir'] = 'dist'  # Common default
 
     # Flutter
     if language == 'dart':
@@ -213,7 +312,7 @@ def detect_build_system(repo_path: Path, language: str, package_manager: Optiona
         build_info['output_dir'] = 'build'
 
     # Python with setup.py
-    if language == 'python' and (repo_path / 'setup.py').exists():
+    if language == 'python' and 'setup.py' in _root_files(repo_path):
         build_info['enabled'] = True
         build_info['command'] = 'python setup.py build'
         build_info['output_dir'] = 'build'
@@ -233,7 +332,9 @@ def detect_build_system(repo_path: Path, language: str, package_manager: Optiona
     return build_info
 
 
-def detect_test_system(repo_path: Path, language: str, package_manager: Optional[str]) -> Dict[str, any]:
+def detect_test_system(repo_path: Path, language: str, package_manager: Optional[str],
+                       package_data: Optional[dict] = None,
+                       requirements_text: Optional[str] = None) -> Dict[str, any]:
     """
     Detect test system and common test commands.
 
@@ -241,6 +342,8 @@ def detect_test_system(repo_path: Path, language: str, package_manager: Optional
         repo_path: Path to repository root
         language: Detected programming language
         package_manager: Detected package manager
+        package_data: Parsed package.json, or None if absent/invalid
+        requirements_text: Contents of requirements.txt, or None if absent
 
     Returns:
         Dictionary with test system information
@@ -252,36 +355,26 @@ def detect_test_system(repo_path: Path, language: str, package_manager: Optional
     }
 
     # Check for test directory
-    tests_exist = (repo_path / 'tests').exists() or (repo_path / 'test').exists()
+    root_files = _root_files(repo_path)
+    tests_exist = 'tests' in root_files or 'test' in root_files
 
     # Check package.json scripts
-    package_json = repo_path / 'package.json'
-    if package_json.exists():
-        try:
-            with open(package_json) as f:
-                data = json.load(f)
-                scripts = data.get('scripts', {})
+    if package_data is not None:
+        scripts = _package_section(package_data, 'scripts')
 
-                if 'test' in scripts:
-                    test_info['enabled'] = True
-                    test_info['command'] = f'{package_manager} test' if package_manager else 'npm test'
-                    test_info['coverage_enabled'] = 'coverage' in scripts
-        except:
-            pass
+        if 'test' in scripts:
+            test_info['enabled'] = True
+            test_info['command'] = f'{package_manager} test' if package_manager else 'npm test'
+            test_info['coverage_enabled'] = 'coverage' in scripts
 
     # Python
     if language == 'python' and tests_exist:
         test_info['enabled'] = True
         # Check for pytest
-        requirements = repo_path / 'requirements.txt'
-        if requirements.exists():
-            try:
-                with open(requirements) as f:
-                    if 'pytest' in f.read().lower():
-                        test_info['command'] = 'pytest'
-                        test_info['coverage_enabled'] = True
-            except:
-                pass
+        if requirements_text is not None:
+            if _PYTEST_RE.search(requirements_text):
+                test_info['command'] = 'pytest'
+                test_info['coverage_enabled'] = True
 
         if not test_info['command']:
             test_info['command'] = 'python -m unittest discover'
@@ -304,7 +397,9 @@ def detect_test_system(repo_path: Path, language: str, package_manager: Optional
     return test_info
 
 
-def detect_lint_system(repo_path: Path, language: str, package_manager: Optional[str]) -> Dict[str, any]:
+def detect_lint_system(repo_path: Path, language: str, package_manager: Optional[str],
+                       package_data: Optional[dict] = None,
+                       requirements_text: Optional[str] = None) -> Dict[str, any]:
     """
     Detect linting system and commands.
 
@@ -312,6 +407,8 @@ def detect_lint_system(repo_path: Path, language: str, package_manager: Optional
         repo_path: Path to repository root
         language: Detected programming language
         package_manager: Detected package manager
+        package_data: Parsed package.json, or None if absent/invalid
+        requirements_text: Contents of requirements.txt, or None if absent
 
     Returns:
         Dictionary with lint system information
@@ -322,46 +419,32 @@ def detect_lint_system(repo_path: Path, language: str, package_manager: Optional
     }
 
     # Check package.json scripts
-    package_json = repo_path / 'package.json'
-    if package_json.exists():
-        try:
-            with open(package_json) as f:
-                data = json.load(f)
-                scripts = data.get('scripts', {})
-                dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-
-                if 'lint' in scripts:
-                    lint_info['enabled'] = True
-                    lint_info['command'] = f'{package_manager} run lint' if package_manager else 'npm run lint'
-                elif 'eslint' in dependencies:
-                    lint_info['enabled'] = True
-                    lint_info['command'] = 'eslint .'
-        except:
-            pass
+    if package_data is not None:
+        scripts = _package_section(package_data, 'scripts')
+        dependencies = _package_section(package_data, 'dependencies', 'devDependencies')
+
+        if 'lint' in scripts:
+            lint_info['enabled'] = True
+            lint_info['command'] = f'{package_manager} run lint' if package_manager else 'npm run lint'
+        elif 'eslint' in dependencies:
+            lint_info['enabled'] = True
+            lint_info['command'] = 'eslint .'
 
     # Python
     if language == 'python':
         # Check for common linters
-        linters = [
-            ('pylint', 'pylint src'),
-            ('flake8', 'flake8 src'),
-            ('black', 'black --check src'),
-            ('ruff', 'ruff check .'),
-        ]
-
-        requirements = repo_path / 'requirements.txt'
-        if requirements.exists():
-            try:
-                with open(requirements) as f:
-                    content = f.read().lower()
-
-                    for linter, command in linters:
-                        if linter in content:
-                            lint_info['enabled'] = True
-                            lint_info['command'] = command
-                            break
-            except:
-                pass
+        linter_commands = {
+            'pylint': 'pylint src',
+            'flake8': 'flake8 src',
+            'black': 'black --check src',
+            'ruff': 'ruff check .',
+        }
+
+        if requirements_text is not None:
+            linter = _first_match(_PY_LINTER_RE, requirements_text, PY_LINTERS)
+            if linter:
+                lint_info['enabled'] = True
+                lint_info['command'] = linter_commands[linter]
 
     # Flutter/Dart
     if language == 'dart':
@@ -381,27 +464,48 @@ def detect_lint_system(repo_path: Path, language: str, package_manager: Optional
     return lint_info
 
 
-def detect_tech_stack(repo_path: Path) -> Dict[str, any]:
+def detect_tech_stack(repo_path: Path, use_cache: bool = True) -> Dict[str, any]:
     """
     Main function to detect complete tech stack.
 
+    Results are cached on disk, keyed by the root listing and manifest contents.
+
     Args:
         repo_path: Path to repository root
+        use_cache: Read and write the on-disk result cache
 
     Returns:
         Complete tech stack information
     """
+    # Read the shared manifests once for all detectors (and the cache key)
+    root_files = _root_files(repo_path)
+    manifests = {}
+    for name in SHARED_MANIFESTS:
+        if name in root_files:
+            raw = _read_bytes_safe(repo_path / name)
+            if raw is not None:
+                manifests[name] = raw
+
+    cache_path = _cache_path(root_files, manifests) if use_cache else None
+    if cache_path:
+        cached = _parse_json_object(_read_bytes_safe(cache_path))
+        if cached is not None:
+            return cached
+
+    package_data = _parse_json_object(manifests.get('package.json'))
+    requirements_text = _decode_text(manifests.get('requirements.txt'))
+
     language_info = detect_language(repo_path)
     language = language_info['language']
 
     package_manager = detect_package_manager(repo_path)
-    framework = detect_framework(repo_path, language) or language_info['framework']
+    framework = detect_framework(repo_path, language, package_data, requirements_text) or language_info['framework']
 
-    build_info = detect_build_system(repo_path, language, package_manager)
-    test_info = detect_test_system(repo_path, language, package_manager)
-    lint_info = detect_lint_system(repo_path, language, package_manager)
+    build_info = detect_build_system(repo_path, language, package_manager, package_data)
+    test_info = detect_test_system(repo_path, language, package_manager, package_data, requirements_text)
+    lint_info = detect_lint_system(repo_path, language, package_manager, package_data, requirements_text)
 
-    return {
+    result = {
         'tech_stack': {
             'primary_language': language,
             'framework': framework,
@@ -413,6 +517,11 @@ def detect_tech_stack(repo_path: Path) -> Dict[str, any]:
         'lint': lint_info,
     }
 
+    if cache_path:
+        _write_cache(cache_path, result)
+
+    return result
+
 
 def main():
     """Main execution function."""
@@ -430,6 +539,17 @@ def main():
         default='json',
         help='Output format (default: json)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the on-disk detection cache'
+    )
+    parser.add_argument(
+        '--query',
+        metavar='DOTTED.PATH',
+        help='Print only one value, e.g. tech_stack.primary_language '
+             '(strings raw, objects as JSON, null as None)'
+    )
 
     args = parser.parse_args()
     repo_path = Path(args.path).resolve()
@@ -439,7 +559,18 @@ def main():
         return 1
 
     # Detect tech stack
-    result = detect_tech_stack(repo_path)
+    result = detect_tech_stack(repo_path, use_cache=not args.no_cache)
+
+    # Single value for shell callers, without a JSON round trip
+    if args.query:
+        value = result
+        for key in args.query.split('.'):
+            if not isinstance(value, dict) or key not in value:
+                print(f"Error: No such field: {args.query}", file=sys.stderr)
+                return 1
+            value = value[key]
+        print(json.dumps(value) if isinstance(value, (dict, list)) else value)
+        return 0
 
     # Output in requested format
     if args.format == 'json':
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Shared runner and helpers for the universal build, lint and test scripts.
+
+Each phase script describes itself with a Phase and hands over to
+run_phase, which resolves the command (explicit, config file, or
+detection), applies the phase's flag modifiers and runs it.
+
+The detector is imported and called in-process rather than started as a
+separate interpreter; its own on-disk result cache lets back-to-back
+build/lint/test runs against the same tree detect only once.
+"""
+
+import os
+import sys
+import json
+import shlex
+import argparse
+import hashlib
+import functools
+import subprocess
+import importlib.util
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# A modifier returns the new argv, or (argv, env) when the command also needs
+# environment variables; those are passed to that command only
+Modifier = Callable[[List[str]], Union[List[str], Tuple[List[str], Dict[str, str]]]]
+Modifiers = Dict[tuple, Modifier]
+
+
+@dataclass(frozen=True)
+class Phase:
+    """How one universal script resolves, adjusts and reports its command."""
+    name: str                  # config/detector section: 'build', 'lint', 'test'
+    description: str           # argparse description
+    flag: str                  # option enabling the modifiers, e.g. '--fix'
+    flag_help: str
+    running: str               # banner before the command, e.g. '🔍 Running lint'
+    passed: str
+    failed: str
+    action: str                # for errors: 'Error running <action>'
+    modifiers: Modifiers = field(default_factory=dict)
+
+    @property
+    def flag_dest(self) -> str:
+        return self.flag.lstrip('-').replace('-', '_')
+
+
+# GitHub Actions folds ::group:: blocks in its logs
+IN_GITHUB_ACTIONS = os.environ.get('GITHUB_ACTIONS') == 'true'
+
+# Detector location within a repository, and the interpreter for running it
+# out of process; resolved once at import
+DETECT_SCRIPT = Path('scripts', 'universal', 'detect_tech_stack.py')
+PYTHON = sys.executable
+
+# Root files without which the detector can't report any build, lint or test
+# command (other languages are recognised but have no commands)
+COMMAND_MARKERS = frozenset({
+    'package.json', 'pubspec.yaml', 'requirements.txt', 'Pipfile',
+    'pyproject.toml', 'Cargo.toml', 'go.mod',
+})
+
+CONFIG_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'vendorplatform' / 'config'
+
+
+def load_config(config_path: Optional[Path]) -> Dict[str, any]:
+    """
+    Load configuration from file if provided.
+
+    Parsed configs are memoized per (path, mtime), so repeated loads of an
+    unchanged file return the same dictionary; callers must not mutate it.
+
+    Args:
+        config_path: Path to config file (YAML or JSON)
+
+    Returns:
+        Configuration dictionary
+    """
+    if not config_path:
+        return {}
+
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return {}
+
+    return _load_config_cached(os.fspath(config_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Dict[str, any]:
+    """Parse a config file and tokenize its commands; mtime_ns is part of the cache key only."""
+    try:
+        config = _parse_config(config_path)
+    except Exception as e:
+        print(f"Warning: Could not load config file: {e}", file=sys.stderr)
+        return {}
+
+    _add_command_argv(config)
+    return config
+
+
+def _parse_config(config_path: str):
+    """
+    Parse a YAML or JSON config file.
+
+    Parsed YAML is also kept on disk as JSON, keyed by the file's contents,
+    so the build, lint and test runs of one CI job parse it only once.
+    """
+    with open(config_path, 'rb') as f:
+        raw = f.read()
+
+    if not config_path.endswith(('.yaml', '.yml')):
+        return json.loads(raw)
+
+    cache_path = CONFIG_CACHE_DIR / f"{hashlib.sha256(raw).hexdigest()}.json"
+    try:
+        with open(cache_path, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    import yaml
+    # libyaml's C loader when PyYAML was built with it
+    config = yaml.load(raw, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    # JSON would turn keys like `1:` or `on:` into strings, so a cached load
+    # would differ from this one; such files are parsed every time
+    if _str_keys_only(config):
+        _write_cache(cache_path, config)
+    return config
+
+
+def _str_keys_only(node) -> bool:
+    """True if every mapping in a parsed YAML tree has only string keys."""
+    if isinstance(node, dict):
+        return all(isinstance(k, str) and _str_keys_only(v) for k, v in node.items())
+    if isinstance(node, list):
+        return all(_str_keys_only(item) for item in node)
+    return True
+
+
+def _add_command_argv(config):
+    """
+    Tokenize each tech_stack.<phase>.command into tech_stack.<phase>.argv.
+
+    Done once per load, so running a configured command needs no further
+    parsing. Commands that don't tokenize are left for run_command to report.
+    """
+    tech_stack = config.get('tech_stack') if isinstance(config, dict) else None
+    if not isinstance(tech_stack, dict):
+        return
+
+    for section in tech_stack.values():
+        if isinstance(section, dict) and isinstance(section.get('command'), str):
+            try:
+                section['argv'] = shlex.split(section['command'])
+            except ValueError:
+                section.pop('argv', None)
+
+
+def _write_cache(cache_path: Path, data):
+    """
+    Store data as JSON atomically; caching is best-effort.
+
+    Data JSON can't represent (e.g. YAML dates) is simply not cached.
+    """
+    try:
+        payload = json.dumps(data)
+    except (TypeError, ValueError):
+        return
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _load_detector(detect_script: Path):
+    """Import a repository's detect_tech_stack.py as a module."""
+    spec = importlib.util.spec_from_file_location('detect_tech_stack', detect_script)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {detect_script}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_detector_subprocess(repo_path: Path, detect_script: Path) -> Dict:
+    """
+    Run the detector as a separate interpreter, for detectors that can't be imported.
+
+    Its stdout is parsed straight from the pipe rather than collected and
+    decoded first.
+    """
+    command = [PYTHON, os.fspath(detect_script), '--path', os.fspath(repo_path)]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        try:
+            tech_info = json.load(proc.stdout)
+        except ValueError as e:
+            parse_error = e
+        else:
+            parse_error = None
+
+    # A failed run is reported as such, not as the unparseable output it left
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+    if parse_error:
+        raise parse_error
+    return tech_info
+
+
+@functools.lru_cache(maxsize=8)
+def detect_tech_info(repo_path: Path) -> Optional[Dict]:
+    """
+    Full tech stack detection output for a repository.
+
+    Imports and runs the repository's detect_tech_stack.py in-process; the
+    detector keeps its own on-disk cache keyed by the repository's contents,
+    so there is no second cache layer here. Within one process each
+    repository is detected once; the returned dict is shared, so callers
+    must not mutate it.
+
+    Args:
+        repo_path: Path to repository root
+
+    Returns:
+        Detection output, or None if the detector is missing or fails
+    """
+    detect_script = repo_path / DETECT_SCRIPT
+
+    if not detect_script.exists():
+        return None
+
+    try:
+        try:
+            detector = _load_detector(detect_script)
+        except ImportError:
+            tech_info = _run_detector_subprocess(repo_path, detect_script)
+        else:
+            tech_info = detector.detect_tech_stack(repo_path)
+
+    except Exception as e:
+        print(f"Warning: Could not run tech stack detection: {e}", file=sys.stderr)
+        return None
+
+    return tech_info
+
+
+def _has_command_marker(repo_path: Path) -> bool:
+    """True if the repository root has any file the detector derives commands from."""
+    try:
+        return not COMMAND_MARKERS.isdisjoint(os.listdir(repo_path))
+    except OSError:
+        return False
+
+
+def detect_command(repo_path: Path, phase: str) -> Optional[str]:
+    """
+    Auto-detect the command for a phase ('build', 'lint' or 'test').
+
+    Args:
+        repo_path: Path to repository root
+        phase: Section of the detection output to read
+
+    Returns:
+        Command or None
+    """
+    # Skip detection outright when its answer is known to be "no command"
+    if not _has_command_marker(repo_path):
+        return None
+
+    tech_info = detect_tech_info(repo_path)
+    if tech_info is None:
+        return None
+    return tech_info.get(phase, {}).get('command')
+
+
+def find_modifier(modifiers: Modifiers, argv: List[str]) -> Optional[Modifier]:
+    """
+    Look up the argv modifier registered for a command's tool.
+
+    Tables are keyed by (tool, subcommand) or just (tool,). Tools run through
+    `npx` or `python -m` are matched by the tool name, as are tools given by
+    path (e.g. node_modules/.bin/eslint).
+
+    Args:
+        modifiers: Modifier table
+        argv: Command to look up
+
+    Returns:
+        Modifier taking argv and returning argv or (argv, env), or None
+    """
+    words = argv
+    if words and words[0] == 'npx':
+        words = words[1:]
+    elif len(words) > 2 and words[1] == '-m' and Path(words[0]).name.startswith('python'):
+        words = words[2:]
+    if not words:
+        return None
+
+    tool = Path(words[0]).name
+    subcommand = words[1] if len(words) > 1 else None
+    return modifiers.get((tool, subcommand)) or modifiers.get((tool,))
+
+
+def run_command(phase: Phase, command: Union[str, List[str], None], modify: bool = False,
+                repo_path: Path = Path('.'), replace_process: bool = False) -> int:
+    """
+    Run a phase's command.
+
+    Args:
+        phase: Phase being run
+        command: Command to run, as a string or an already tokenized argv
+        modify: Whether to apply the phase's flag modifiers
+        repo_path: Path to repository root
+        replace_process: exec the command in place of this process, so its
+            exit status is the script's; no result banner is printed
+
+    Returns:
+        Exit code (0 = success, non-zero = failure)
+    """
+    if not command:
+        print(f"Error: No {phase.name} command specified or detected", file=sys.stderr)
+        return 1
+
+    # Run without a shell: string commands are split into argv here
+    try:
+        argv = list(command) if isinstance(command, list) else shlex.split(command)
+    except ValueError as e:
+        print(f"Error: Could not parse {phase.name} command: {e}", file=sys.stderr)
+        return 1
+
+    if not argv:
+        print(f"Error: No {phase.name} command specified or detected", file=sys.stderr)
+        return 1
+
+    extra_env = {}
+    if modify:
+        modifier = find_modifier(phase.modifiers, argv)
+        if modifier:
+            argv = modifier(argv)
+            if isinstance(argv, tuple):
+                argv, extra_env = argv
+
+    # Extra variables go to this command only, never into os.environ, so they
+    # don't leak into later phases run from the same process
+    env = {**os.environ, **extra_env} if extra_env else None
+    shown = shlex.join([f"{k}={v}" for k, v in extra_env.items()] + argv)
+
+    # On GitHub Actions the command's output goes in a collapsible group
+    # instead of between separator banners
+    grouped = IN_GITHUB_ACTIONS and not replace_process
+    if grouped:
+        print(f"::group::{phase.running}: {shown}")
+    else:
+        print(f"{phase.running}: {shown}")
+        print("=" * 50)
+
+    # The command writes to the same stdout; don't let it overtake the banner
+    sys.stdout.flush()
+
+    if replace_process:
+        try:
+            os.chdir(repo_path)
+            if env is None:
+                os.execvp(argv[0], argv)
+            else:
+                os.execvpe(argv[0], argv, env)
+        except OSError as e:
+            print(f"\n❌ Error running {phase.action}: {e}", file=sys.stderr)
+            return 1
+
+    try:
+        result = subprocess.run(
+            argv,
+            cwd=repo_path,
+            env=env,
+            check=False
+        )
+    except Exception as e:
+        if grouped:
+            print("::endgroup::")
+        print(f"\n❌ Error running {phase.action}: {e}", file=sys.stderr)
+        return 1
+
+    if grouped:
+        print("::endgroup::")
+    else:
+        print("\n" + "=" * 50)
+    print(phase.passed if result.returncode == 0 else phase.failed)
+
+    return result.returncode
+
+
+def run_phase(phase: Phase, argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point shared by the phase scripts.
+
+    Args:
+        phase: Phase to run
+        argv: Arguments to parse (default: sys.argv[1:])
+
+    Returns:
+        Exit code (0 = success, non-zero = failure)
+    """
+    parser = argparse.ArgumentParser(description=phase.description)
+    parser.add_argument(
+        '--config',
+        type=Path,
+        help='Path to configuration file (optional)'
+    )
+    parser.add_argument(
+        phase.flag,
+        action='store_true',
+        help=phase.flag_help
+    )
+    parser.add_argument(
+        '--command',
+        help=f'Explicitly specify {phase.name} command (overrides detection)'
+    )
+    parser.add_argument(
+        '--path',
+        type=Path,
+        default=Path('.'),
+        help='Path to repository root (default: current directory)'
+    )
+    parser.add_argument(
+        '--exec',
+        action='store_true',
+        dest='replace_process',
+        help='Replace this process with the command (no result banner)'
+    )
+
+    args = parser.parse_args(argv)
+    repo_path = args.path.resolve()
+
+    # Determine the command
+    command = None
+
+    # Priority 1: Explicit command
+    if args.command:
+        command = args.command
+        print(f"📝 Using explicitly provided {phase.name} command")
+
+    # Priority 2: Config file
+    elif args.config:
+        config = load_config(args.config)
+        section = config.get('tech_stack', {}).get(phase.name, {})
+        command = section.get('argv') or section.get('command')
+        if command:
+            print(f"📝 Using {phase.name} command from config file")
+
+    # Priority 3: Auto-detection
+    if not command:
+        print(f"🔍 Auto-detecting {phase.name} command...")
+        command = detect_command(repo_path, phase.name)
+        if command:
+            print(f"✓ Detected {phase.name} command: {command}")
+
+    return run_command(phase, command, getattr(args, phase.flag_dest), repo_path,
+                       replace_process=args.replace_process)
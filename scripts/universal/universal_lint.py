@@ -11,38 +11,40 @@ Usage:
 Configuration: Reads from config file or auto-detects tech stack
 """
 
-import os
 import sys
-import json
-import argparse
-import subprocess
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Optional
 
+from universal_common import Phase, detect_command, run_command, run_phase
 
-def load_config(config_path: Optional[Path]) -> Dict[str, any]:
-    """
-    Load configuration from file if provided.
 
-    Args:
-        config_path: Path to config file (YAML or JSON)
+# Auto-fix tweaks, keyed by (tool, subcommand) or (tool,)
+def _append_fix(argv):
+    return argv + ['--fix']
+
+
+def _drop_check(argv):
+    return [arg for arg in argv if arg != '--check']
 
-    Returns:
-        Configuration dictionary
-    """
-    if not config_path or not config_path.exists():
-        return {}
 
-    try:
-        with open(config_path) as f:
-            if config_path.suffix in ['.yaml', '.yml']:
-                import yaml
-                return yaml.safe_load(f)
-            else:
-                return json.load(f)
-    except Exception as e:
-        print(f"Warning: Could not load config file: {e}", file=sys.stderr)
-        return {}
+FIX_MODIFIERS = {
+    ('eslint',): _append_fix,
+    ('black',): _drop_check,
+    ('ruff',): _append_fix,
+    ('cargo', 'clippy'): _append_fix,
+}
+
+LINT = Phase(
+    name='lint',
+    description='Universal lint script for any repository',
+    flag='--fix',
+    flag_help='Automatically fix linting issues where possible',
+    running='🔍 Running lint',
+    passed='✅ Linting passed!',
+    failed='❌ Linting found issues!',
+    action='lint',
+    modifiers=FIX_MODIFIERS,
+)
 
 
 def detect_lint_command(repo_path: Path) -> Optional[str]:
@@ -55,25 +57,7 @@ def detect_lint_command(repo_path: Path) -> Optional[str]:
     Returns:
         Lint command or None
     """
-    detect_script = repo_path / 'scripts' / 'universal' / 'detect_tech_stack.py'
-
-    if not detect_script.exists():
-        return None
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(detect_script), '--path', str(repo_path)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        tech_info = json.loads(result.stdout)
-        return tech_info.get('lint', {}).get('command')
-
-    except Exception as e:
-        print(f"Warning: Could not auto-detect lint command: {e}", file=sys.stderr)
-        return None
+    return detect_command(repo_path, 'lint')
 
 
 def run_lint(lint_command: str, fix: bool = False, repo_path: Path = Path('.')) -> int:
@@ -88,99 +72,12 @@ def run_lint(lint_command: str, fix: bool = False, repo_path: Path = Path('.'))
     Returns:
         Exit code (0 = success, non-zero = failure)
     """
-    if not lint_command:
-        print("Error: No lint command specified or detected", file=sys.stderr)
-        return 1
-
-    # Modify command for auto-fix if requested
-    if fix:
-        if 'eslint' in lint_command:
-            lint_command = f"{lint_command} --fix"
-        elif 'black' in lint_command:
-            lint_command = lint_command.replace('--check', '')
-        elif 'ruff' in lint_command:
-            lint_command = f"{lint_command} --fix"
-        elif 'cargo clippy' in lint_command:
-            lint_command = f"{lint_command} --fix"
-
-    print(f"🔍 Running lint: {lint_command}")
-    print("=" * 50)
-
-    try:
-        result = subprocess.run(
-            lint_command,
-            shell=True,
-            cwd=repo_path,
-            check=False
-        )
-
-        if result.returncode == 0:
-            print("\n" + "=" * 50)
-            print("✅ Linting passed!")
-        else:
-            print("\n" + "=" * 50)
-            print("❌ Linting found issues!")
-
-        return result.returncode
-
-    except Exception as e:
-        print(f"\n❌ Error running lint: {e}", file=sys.stderr)
-        return 1
+    return run_command(LINT, lint_command, fix, repo_path)
 
 
 def main():
     """Main execution function."""
-    parser = argparse.ArgumentParser(
-        description='Universal lint script for any repository'
-    )
-    parser.add_argument(
-        '--config',
-        type=Path,
-        help='Path to configuration file (optional)'
-    )
-    parser.add_argument(
-        '--fix',
-        action='store_true',
-        help='Automatically fix linting issues where possible'
-    )
-    parser.add_argument(
-        '--command',
-        help='Explicitly specify lint command (overrides detection)'
-    )
-    parser.add_argument(
-        '--path',
-        type=Path,
-        default=Path('.'),
-        help='Path to repository root (default: current directory)'
-    )
-
-    args = parser.parse_args()
-    repo_path = args.path.resolve()
-
-    # Determine lint command
-    lint_command = None
-
-    # Priority 1: Explicit command
-    if args.command:
-        lint_command = args.command
-        print(f"📝 Using explicitly provided lint command")
-
-    # Priority 2: Config file
-    elif args.config:
-        config = load_config(args.config)
-        lint_command = config.get('tech_stack', {}).get('lint', {}).get('command')
-        if lint_command:
-            print(f"📝 Using lint command from config file")
-
-    # Priority 3: Auto-detection
-    if not lint_command:
-        print("🔍 Auto-detecting lint command...")
-        lint_command = detect_lint_command(repo_path)
-        if lint_command:
-            print(f"✓ Detected lint command: {lint_command}")
-
-    # Run lint
-    return run_lint(lint_command, args.fix, repo_path)
+    return run_phase(LINT)
 
 
 if __name__ == '__main__':
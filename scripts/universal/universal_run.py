@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Universal Phase Runner
+
+This script runs the build, lint and test phases for any repository in
+one process, detecting the tech stack once for all of them. It accepts
+the same configuration inputs as the individual phase scripts.
+
+Usage:
+    python scripts/universal/universal_run.py [--phases build,lint,test] [--config CONFIG_FILE]
+
+Configuration: Reads from config file or auto-detects tech stack
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from universal_build import BUILD
+from universal_common import detect_command, load_config, run_command
+from universal_lint import LINT
+from universal_test import TEST
+
+PHASES = {phase.name: phase for phase in (BUILD, LINT, TEST)}
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(
+        description='Run build, lint and test phases for any repository'
+    )
+    parser.add_argument(
+        '--phases',
+        default=','.join(PHASES),
+        help='Comma-separated phases to run, in order (default: build,lint,test)'
+    )
+    parser.add_argument(
+        '--config',
+        type=Path,
+        help='Path to configuration file (optional)'
+    )
+    parser.add_argument(
+        '--production',
+        action='store_true',
+        help='Build for production'
+    )
+    parser.add_argument(
+        '--fix',
+        action='store_true',
+        help='Automatically fix linting issues where possible'
+    )
+    parser.add_argument(
+        '--coverage',
+        action='store_true',
+        help='Enable coverage reporting'
+    )
+    parser.add_argument(
+        '--path',
+        type=Path,
+        default=Path('.'),
+        help='Path to repository root (default: current directory)'
+    )
+
+    args = parser.parse_args()
+    repo_path = args.path.resolve()
+
+    names = [name.strip() for name in args.phases.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PHASES]
+    if unknown:
+        parser.error(f"unknown phase(s): {', '.join(unknown)}")
+
+    config = load_config(args.config) if args.config else {}
+    configured = config.get('tech_stack', {})
+
+    for phase in (PHASES[name] for name in names):
+        section = configured.get(phase.name, {})
+        command = section.get('argv') or section.get('command')
+        if command:
+            print(f"📝 Using {phase.name} command from config file")
+        else:
+            # Only the first detection runs the detector; later phases hit its cache
+            print(f"🔍 Auto-detecting {phase.name} command...")
+            command = detect_command(repo_path, phase.name)
+            if command:
+                print(f"✓ Detected {phase.name} command: {command}")
+
+        exit_code = run_command(phase, command, getattr(args, phase.flag_dest), repo_path)
+
+        # Stop at the first failing phase, like a `&&` chain
+        if exit_code != 0:
+            return exit_code
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
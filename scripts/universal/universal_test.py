@@ -11,38 +11,44 @@ Usage:
 Configuration: Reads from config file or auto-detects tech stack
 """
 
-import os
 import sys
-import json
-import argparse
-import subprocess
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Optional
 
+from universal_common import Phase, detect_command, run_command, run_phase
 
-def load_config(config_path: Optional[Path]) -> Dict[str, any]:
-    """
-    Load configuration from file if provided.
 
-    Args:
-        config_path: Path to config file (YAML or JSON)
+# Coverage tweaks, keyed by (tool, subcommand) or (tool,)
+def _pytest_coverage(argv):
+    return argv + ['--cov', '--cov-report=html', '--cov-report=term']
+
+
+def _script_coverage(argv):
+    # Everything after `--` is passed through to the test script
+    return argv + ['--', '--coverage']
 
-    Returns:
-        Configuration dictionary
-    """
-    if not config_path or not config_path.exists():
-        return {}
 
-    try:
-        with open(config_path) as f:
-            if config_path.suffix in ['.yaml', '.yml']:
-                import yaml
-                return yaml.safe_load(f)
-            else:
-                return json.load(f)
-    except Exception as e:
-        print(f"Warning: Could not load config file: {e}", file=sys.stderr)
-        return {}
+COVERAGE_MODIFIERS = {
+    ('pytest',): _pytest_coverage,
+    ('npm',): _script_coverage,
+    ('pnpm',): _script_coverage,
+    ('yarn',): _script_coverage,
+    ('flutter', 'test'): lambda argv: argv + ['--coverage'],
+    ('go', 'test'): lambda argv: argv + ['-cover'],
+    ('cargo', 'test'): lambda argv: ['cargo', 'tarpaulin'],
+}
+
+TEST = Phase(
+    name='test',
+    description='Universal test runner for any repository',
+    flag='--coverage',
+    flag_help='Enable coverage reporting',
+    running='🧪 Running tests',
+    passed='✅ All tests passed!',
+    failed='❌ Tests failed!',
+    action='tests',
+    modifiers=COVERAGE_MODIFIERS,
+)
 
 
 def detect_test_command(repo_path: Path) -> Optional[str]:
@@ -55,25 +61,7 @@ def detect_test_command(repo_path: Path) -> Optional[str]:
     Returns:
         Test command or None
     """
-    detect_script = repo_path / 'scripts' / 'universal' / 'detect_tech_stack.py'
-
-    if not detect_script.exists():
-        return None
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(detect_script), '--path', str(repo_path)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        tech_info = json.loads(result.stdout)
-        return tech_info.get('test', {}).get('command')
-
-    except Exception as e:
-        print(f"Warning: Could not auto-detect test command: {e}", file=sys.stderr)
-        return None
+    return detect_command(repo_path, 'test')
 
 
 def run_tests(test_command: str, coverage: bool = False, repo_path: Path = Path('.')) -> int:
@@ -88,101 +76,12 @@ def run_tests(test_command: str, coverage: bool = False, repo_path: Path = Path(
     Returns:
         Exit code (0 = success, non-zero = failure)
     """
-    if not test_command:
-        print("Error: No test command specified or detected", file=sys.stderr)
-        return 1
-
-    # Modify command for coverage if requested
-    if coverage:
-        if 'pytest' in test_command:
-            test_command = f"{test_command} --cov --cov-report=html --cov-report=term"
-        elif 'npm' in test_command or 'yarn' in test_command:
-            test_command = test_command.replace('test', 'test -- --coverage')
-        elif 'flutter test' in test_command:
-            test_command = f"{test_command} --coverage"
-        elif 'go test' in test_command:
-            test_command = f"{test_command} -cover"
-        elif 'cargo test' in test_command:
-            test_command = "cargo tarpaulin"
-
-    print(f"🧪 Running tests: {test_command}")
-    print("=" * 50)
-
-    try:
-        result = subprocess.run(
-            test_command,
-            shell=True,
-            cwd=repo_path,
-            check=False
-        )
-
-        if result.returncode == 0:
-            print("\n" + "=" * 50)
-            print("✅ All tests passed!")
-        else:
-            print("\n" + "=" * 50)
-            print("❌ Tests failed!")
-
-        return result.returncode
-
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}", file=sys.stderr)
-        return 1
+    return run_command(TEST, test_command, coverage, repo_path)
 
 
 def main():
     """Main execution function."""
-    parser = argparse.ArgumentParser(
-        description='Universal test runner for any repository'
-    )
-    parser.add_argument(
-        '--config',
-        type=Path,
-        help='Path to configuration file (optional)'
-    )
-    parser.add_argument(
-        '--coverage',
-        action='store_true',
-        help='Enable coverage reporting'
-    )
-    parser.add_argument(
-        '--command',
-        help='Explicitly specify test command (overrides detection)'
-    )
-    parser.add_argument(
-        '--path',
-        type=Path,
-        default=Path('.'),
-        help='Path to repository root (default: current directory)'
-    )
-
-    args = parser.parse_args()
-    repo_path = args.path.resolve()
-
-    # Determine test command
-    test_command = None
-
-    # Priority 1: Explicit command
-    if args.command:
-        test_command = args.command
-        print(f"📝 Using explicitly provided test command")
-
-    # Priority 2: Config file
-    elif args.config:
-        config = load_config(args.config)
-        test_command = config.get('tech_stack', {}).get('test', {}).get('command')
-        if test_command:
-            print(f"📝 Using test command from config file")
-
-    # Priority 3: Auto-detection
-    if not test_command:
-        print("🔍 Auto-detecting test command...")
-        test_command = detect_test_command(repo_path)
-        if test_command:
-            print(f"✓ Detected test command: {test_command}")
-
-    # Run tests
-    return run_tests(test_command, args.coverage, repo_path)
+    return run_phase(TEST)
 
 
 if __name__ == '__main__':
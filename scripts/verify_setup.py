@@ -8,8 +8,35 @@ and dependencies. Can be run locally or in CI/CD.
 
 import os
 import sys
+import functools
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Required files: (path, description)
+REQUIRED_FILES = [
+    ("CLAUDE.md", "Factory Constitution"),
+    (".github/workflows/hunter-loop.yml", "Trend Hunter Workflow"),
+    (".github/workflows/growth-engine.yml", "Growth Engine Workflow"),
+    (".github/workflows/claude.yml", "Claude Code Action Workflow"),
+    ("scripts/agents/trend_hunter.py", "Trend Hunter Script"),
+    ("scripts/agents/autonomous_growth.py", "Autonomous Growth Script"),
+    ("docs/USER_MANUAL.md", "User Manual"),
+]
+
+REQUIRED_PACKAGES = ["anthropic", "github", "feedparser"]
+
+# Optional files: (path, description)
+OPTIONAL_FILES = [
+    ("config/ideal-customer-profile.yaml", "ICP Configuration"),
+    (".repo-index/components.yaml", "Component Index"),
+    ("docs/KNOWN_ISSUES.md", "Known Issues Documentation"),
+]
+
+# File and package checks are independent and mostly wait on the filesystem
+# or on imports, so they run together on a small pool
+CHECK_WORKERS = 8
+
 
 def check_secret(name, env_var):
     """
@@ -34,6 +61,19 @@ def check_secret(name, env_var):
     return True, f"✅ {name} ({env_var}) is configured"
 
 
+@functools.lru_cache(maxsize=None)
+def _listing(directory):
+    """
+    Names in a directory, read once and shared by every check under it.
+
+    Returns an empty set if the directory is missing or unreadable.
+    """
+    try:
+        return frozenset(os.listdir(directory))
+    except OSError:
+        return frozenset()
+
+
 def check_file(path, description):
     """
     Check if a required file exists.
@@ -45,7 +85,8 @@ def check_file(path, description):
     Returns:
         Tuple of (exists: bool, message: str)
     """
-    if Path(path).exists():
+    path = Path(path)
+    if path.name in _listing(path.parent):
         return True, f"✅ {description} exists at {path}"
     else:
         return False, f"❌ {description} missing at {path}"
@@ -61,10 +102,10 @@ def check_python_package(package_name):
     Returns:
         Tuple of (installed: bool, message: str)
     """
-    try:
-        __import__(package_name)
+    # Locate the package without importing (and so executing) it
+    if importlib.util.find_spec(package_name) is not None:
         return True, f"✅ Python package '{package_name}' is installed"
-    except ImportError:
+    else:
         return False, f"❌ Python package '{package_name}' is NOT installed"
 
 
@@ -76,6 +117,16 @@ def main():
     all_checks_passed = True
     warnings = []
 
+    # Start every file and package check up front; results keep list order
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+        file_results = executor.map(lambda check: check_file(*check), REQUIRED_FILES)
+        package_results = executor.map(check_python_package, REQUIRED_PACKAGES)
+        optional_results = executor.map(lambda check: check_file(*check), OPTIONAL_FILES)
+
+        file_checks = list(file_results)
+        package_checks = list(package_results)
+        optional_checks = list(optional_results)
+
     # ========================================
     # 1. Check Required Secrets
     # ========================================
@@ -97,16 +148,6 @@ def main():
     # ========================================
     print("\n📁 Checking Required Files...")
 
-    file_checks = [
-        check_file("CLAUDE.md", "Factory Constitution"),
-        check_file(".github/workflows/hunter-loop.yml", "Trend Hunter Workflow"),
-        check_file(".github/workflows/growth-engine.yml", "Growth Engine Workflow"),
-        check_file(".github/workflows/claude.yml", "Claude Code Action Workflow"),
-        check_file("scripts/agents/trend_hunter.py", "Trend Hunter Script"),
-        check_file("scripts/agents/autonomous_growth.py", "Autonomous Growth Script"),
-        check_file("docs/USER_MANUAL.md", "User Manual"),
-    ]
-
     for passed, message in file_checks:
         print(f"   {message}")
         if not passed:
@@ -117,12 +158,6 @@ def main():
     # ========================================
     print("\n🐍 Checking Python Dependencies...")
 
-    package_checks = [
-        check_python_package("anthropic"),
-        check_python_package("github"),
-        check_python_package("feedparser"),
-    ]
-
     for passed, message in package_checks:
         print(f"   {message}")
         if not passed:
@@ -133,12 +168,6 @@ def main():
     # ========================================
     print("\n⚙️  Checking Optional Configuration...")
 
-    optional_checks = [
-        check_file("config/ideal-customer-profile.yaml", "ICP Configuration"),
-        check_file(".repo-index/components.yaml", "Component Index"),
-        check_file("docs/KNOWN_ISSUES.md", "Known Issues Documentation"),
-    ]
-
     for passed, message in optional_checks:
         print(f"   {message}")
         if not passed and "Component Index" in message: